@@ -0,0 +1,78 @@
+"""Throughput of donut-cached pages against uncached full-page renders.
+
+Runs in-process against the ``mock`` project's settings: a page with N
+component rows plus one personalized hole is rendered through
+RequestFactory, once per request uncached and once through
+``djuno.donut.donut_cache``.
+
+    python benchmarks/donut_cache.py --rows 200 --requests 200
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / 'mock')]
+os.chdir(ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mock.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.http import HttpResponse  # noqa: E402
+from django.template import Context, Template  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from djuno.donut import donut_cache  # noqa: E402
+from djuno.registry import registry  # noqa: E402
+
+PAGE = Template('''<!DOCTYPE html><html><body>
+<header>{{ greeting }}</header>
+<table>{% for row in rows %}<tr><td>{{ row.icon }}</td><td>{{ row.button }}</td></tr>{% endfor %}</table>
+</body></html>''')
+
+
+def make_view(rows: int):
+    def page(request):
+        context = Context({
+            'greeting': registry['button'](text='Welcome', hole='greeting').render(),
+            'rows': [{
+                'icon': registry['icon'](name='star').render(),
+                'button': registry['button'](text=f'Row {i}', id=f'row-{i}').render(),
+            } for i in range(rows)],
+        })
+        return HttpResponse(PAGE.render(context))
+    return page
+
+
+def bench(view, requests: int) -> float:
+    factory = RequestFactory()
+    start = time.perf_counter()
+    for i in range(requests):
+        view(factory.get('/', HTTP_X_USER=f'user{i % 10}'))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    page = make_view(args.rows)
+    cached = donut_cache(holes={
+        'greeting': lambda request: {'text': f"Welcome {request.headers['X-User']}"},
+    })(page)
+    cached(RequestFactory().get('/', HTTP_X_USER='warmup'))
+
+    full = bench(page, args.requests)
+    donut = bench(cached, args.requests)
+    print(f"{args.rows} rows, {args.requests} requests")
+    print(f"{'full render':<14}{full:>10.1f} req/s")
+    print(f"{'donut cache':<14}{donut:>10.1f} req/s  ({donut / full:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""In-process load test of Djuno pages through Django's WSGI and ASGI handlers.
+
+Drives the ``djuno_project`` index view, the example project's page
+(``example/myproject``'s ``my_template.html``, rendered from its own
+template directory) and a synthetic page of N component rows with a pool
+of concurrent clients, with no server, socket
+or external load generator. Each run reports requests per second,
+p50/p95/p99 latency and memory allocated per request (tracemalloc, in a
+separate sequential pass so tracing doesn't skew the timings), for every
+combination of caches given with ``--caches``:
+
+    compile   compiled components stay in the registry and compile cache
+    fragment  synthetic rows are wrapped in ``{% cache %}``
+    render    the page shell is cached with ``djuno.donut.donut_cache``
+
+    python benchmarks/load.py --rows 100 --requests 400 --concurrency 8
+    python benchmarks/load.py --caches none compile compile+render
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT)]
+os.chdir(ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djuno_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.template import Context, Engine, engines  # noqa: E402
+from django.urls import include, path  # noqa: E402
+from djuno import compiler  # noqa: E402
+from djuno.component import from_dj_file  # noqa: E402
+from djuno.donut import donut_cache  # noqa: E402
+from djuno.registry import ComponentRegistry, registry  # noqa: E402
+from djuno_project.views import index  # noqa: E402
+
+ROW = ("<tr><td>{% icon_component name='star' %}</td>"
+       "<td>{% button_component text='Row' id=i %}</td></tr>")
+PAGE = '''{% load cache djuno %}<!DOCTYPE html><html><body><table>
+{% for i in rows %}__ROW__{% endfor %}
+</table></body></html>'''
+PAGES = {
+    False: engines['django'].from_string(PAGE.replace('__ROW__', ROW)),
+    True: engines['django'].from_string(PAGE.replace(
+        '__ROW__', '{% cache 300 djuno_row i %}' + ROW + '{% endcache %}')),
+}
+EXAMPLE = Engine(dirs=[str(ROOT / 'example' / 'myproject' / 'templates')],
+                 libraries={'djuno': 'djuno.templatetags.djuno'})
+CACHES = ('compile', 'fragment', 'render')
+
+state = {'rows': 100, 'caches': set()}
+
+
+def synthetic(request):
+    page = PAGES['fragment' in state['caches']]
+    return HttpResponse(page.render({'rows': range(state['rows'])}, request))
+
+
+def example(request):
+    return HttpResponse(EXAMPLE.get_template('my_template.html').render(Context()))
+
+
+def toggled(view):
+    cached = donut_cache()(view)
+
+    def dispatch(request):
+        if 'render' in state['caches']:
+            return cached(request)
+        return view(request)
+    return dispatch
+
+
+urlpatterns = [
+    path('', toggled(index), name='index'),
+    path('example/', toggled(example), name='example'),
+    path('synthetic/', toggled(synthetic), name='synthetic'),
+    path('djuno/', include('djuno.urls')),
+]
+settings.ROOT_URLCONF = __name__
+
+TARGETS = {'index': '/', 'example': '/example/', 'synthetic': '/synthetic/'}
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, sections):
+        pass
+
+
+def uncached_lookup(self, key):
+    return from_dj_file(self.file_paths[key])
+
+
+def use_caches(stack: ExitStack, enabled):
+    """Apply a cache combination for the duration of ``stack``."""
+    state['caches'] = set(enabled)
+    caches['default'].clear()
+    if 'compile' not in enabled:
+        stack.enter_context(mock.patch.object(
+            compiler, 'compile_cache', NullCache()))
+        stack.enter_context(mock.patch.object(
+            ComponentRegistry, '__getitem__', uncached_lookup))
+    registry.components.clear()
+
+
+def wsgi_environ(url: str) -> dict:
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def wsgi_request(handler, url: str) -> int:
+    status = []
+    body = handler(wsgi_environ(url), lambda s, headers: status.append(s))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(handler, url: str) -> int:
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url,
+        'raw_path': url.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    done = asyncio.Event()
+    status = []
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            done.set()
+
+    await handler(scope, receive, send)
+    done.set()
+    return status[0]
+
+
+def run_wsgi(handler, url: str, requests: int, concurrency: int):
+    def timed(_):
+        start = time.perf_counter()
+        status = wsgi_request(handler, url)
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(timed, range(requests)))
+    return results, time.perf_counter() - start
+
+
+def run_asgi(handler, url: str, requests: int, concurrency: int):
+    async def client(queue, results):
+        while queue:
+            queue.pop()
+            start = time.perf_counter()
+            status = await asgi_request(handler, url)
+            results.append((time.perf_counter() - start, status))
+
+    async def main():
+        queue = list(range(requests))
+        results = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(queue, results) for _ in range(concurrency)))
+        return results, time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def allocated_per_request(handler, url: str, samples: int) -> float:
+    """Mean peak traced memory of one request, in KiB."""
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            wsgi_request(handler, url)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / samples / 1024
+
+
+def percentile(sorted_values, pct: float) -> float:
+    index = min(int(len(sorted_values) * pct / 100), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def report(server: str, target: str, combo: str, results, elapsed: float, kib: float):
+    latencies = sorted(duration * 1000 for duration, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    print(f"{server:<5} {target:<10} {combo:<24}"
+          f"{len(results) / elapsed:>9.1f}"
+          f"{statistics.median(latencies):>9.2f}"
+          f"{percentile(latencies, 95):>9.2f}"
+          f"{percentile(latencies, 99):>9.2f}"
+          f"{kib:>10.1f}"
+          + (f"  {errors} errors" if errors else ''))
+
+
+def enabled_caches(combo: str):
+    return set() if combo == 'none' else set(combo.split('+'))
+
+
+def parse_combo(combo: str):
+    unknown = enabled_caches(combo) - set(CACHES)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown cache(s): {', '.join(sorted(unknown))}")
+    return combo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--targets', nargs='+',
+                        choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument('--servers', nargs='+',
+                        choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--rows', type=int, default=100,
+                        help='component rows on the synthetic page')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--alloc-samples', type=int, default=20)
+    parser.add_argument('--caches', nargs='+', type=parse_combo,
+                        default=['none', 'compile', 'compile+fragment', 'compile+fragment+render'])
+    args = parser.parse_args()
+    state['rows'] = args.rows
+
+    handlers = {'wsgi': WSGIHandler(), 'asgi': ASGIHandler()}
+    runners = {'wsgi': run_wsgi, 'asgi': run_asgi}
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"{args.rows} synthetic rows")
+    print(f"{'':<5} {'target':<10} {'caches':<24}{'req/s':>9}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'p99 ms':>9}{'KiB/req':>10}")
+    for server in args.servers:
+        handler = handlers[server]
+        for target in args.targets:
+            url = TARGETS[target]
+            for combo in args.caches:
+                with ExitStack() as stack:
+                    use_caches(stack, enabled_caches(combo))
+                    wsgi_request(handlers['wsgi'], url)
+                    kib = allocated_per_request(
+                        handlers['wsgi'], url, args.alloc_samples)
+                    results, elapsed = runners[server](
+                        handler, url, args.requests, args.concurrency)
+                report(server, target, combo, results, elapsed, kib)
+
+
+if __name__ == '__main__':
+    main()
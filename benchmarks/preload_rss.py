@@ -0,0 +1,130 @@
+"""Per-worker memory of a forked server with and without registry preload.
+
+Builds a synthetic registry of N components, forks W workers that each
+touch every component, and reports RSS, PSS and private (USS) memory as
+read from /proc/<pid>/smaps_rollup (Linux only).
+
+    python benchmarks/preload_rss.py --components 1000 --workers 8
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Components read DJUNO_* settings when they are built and rendered.
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djuno_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from djuno.compiler import cache_key  # noqa: E402
+from djuno.registry import ComponentRegistry  # noqa: E402
+from djuno.store import build_store  # noqa: E402
+
+TEMPLATE = '''<div class="{{ class }} card-__I__" {% if id %}id="{{ id }}"{% endif %}>
+  <header class="card-header">{{ text }} #__I__</header>
+  <section class="card-body">
+    {% if icon %}<span class="mr-2">{{ icon }}</span>{% endif %}
+    <slot></slot>
+  </section>
+  <footer class="card-footer"><slot name="footer"></slot></footer>
+</div>'''
+STYLE = '.card-__I__ { padding: 1rem; border-radius: 0.25rem; }\n' * 8
+SCRIPT = 'export default { name: "card___I__", props: { text: { type: String } } };\n' * 6
+
+
+def make_components(base_dir: Path, count: int):
+    """Write .dj files and a warm pickle cache for ``count`` components."""
+    cache_dir = base_dir / 'djuno' / 'cache' / 'components'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        sections = {
+            'template': TEMPLATE.replace('__I__', str(i)),
+            'style': STYLE.replace('__I__', str(i)),
+            'script': SCRIPT.replace('__I__', str(i)),
+        }
+        dj_file = base_dir / 'components' / f'card_{i}' / f'card_{i}.dj'
+        dj_file.parent.mkdir(parents=True)
+        dj_file.write_text(
+            f"<template>{sections['template']}</template>\n"
+            f"<style scoped>{sections['style']}</style>\n"
+            f"<script lang=\"ts\">{sections['script']}</script>\n")
+        with open(cache_dir / f'{cache_key(str(dj_file))}.pkl', 'wb') as f:
+            pickle.dump(sections, f)
+
+
+def memory() -> dict:
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'uss': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+
+def run(registry: ComponentRegistry, workers: int) -> dict:
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        if os.fork() == 0:
+            os.close(read_fd)
+            for name in registry.file_paths:
+                registry[name](text='x').get_context_data()
+            os.write(write_fd, pickle.dumps(memory()))
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append(read_fd)
+
+    samples = []
+    for read_fd in pipes:
+        with os.fdopen(read_fd, 'rb') as f:
+            samples.append(pickle.loads(f.read()))
+    for _ in pipes:
+        os.wait()
+    return {key: sum(s[key] for s in samples) / len(samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--components', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--mode', choices=['lazy', 'preload', 'store'])
+    args = parser.parse_args()
+
+    if args.mode is None:
+        # Each mode runs in a fresh interpreter so they don't share a heap.
+        print(f"{args.components} components, {args.workers} workers (kB per worker)")
+        print(f"{'mode':<10}{'rss':>10}{'pss':>10}{'uss':>10}")
+        for mode in ('lazy', 'preload', 'store'):
+            sys.stdout.flush()
+            os.spawnv(os.P_WAIT, sys.executable, [
+                sys.executable, __file__, '--mode', mode,
+                '--components', str(args.components),
+                '--workers', str(args.workers)])
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        make_components(base_dir, args.components)
+        os.chdir(base_dir)
+        registry = ComponentRegistry('components')
+        if args.mode == 'preload':
+            registry.preload()
+        elif args.mode == 'store':
+            build_store(registry.file_paths, 'components.store')
+            registry.preload('components.store')
+        result = run(registry, args.workers)
+        print(f"{args.mode:<10}{result['rss']:>10.0f}{result['pss']:>10.0f}{result['uss']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
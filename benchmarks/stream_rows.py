@@ -0,0 +1,101 @@
+"""Peak memory and throughput of streamed against list-based row rendering.
+
+Fills an in-memory SQLite table with N rows, then renders one ``button``
+component per row two ways and consumes the response body chunk by
+chunk, as a server writing to a socket would:
+
+    list     materialize the QuerySet, render every row, join, HttpResponse
+    stream   ``djuno.stream.stream_components`` over ``.iterator()``
+
+Throughput is timed without tracing; peak memory is measured in a
+separate tracemalloc pass.
+
+    python benchmarks/stream_rows.py --rows 100000 --chunk-size 500
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT)]
+os.chdir(ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'djuno_project.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+django.setup()
+settings.DATABASES['default']['NAME'] = ':memory:'
+
+from django.db import connection, models  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from djuno.registry import registry  # noqa: E402
+from djuno.stream import stream_components  # noqa: E402
+
+
+class Row(models.Model):
+    title = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'djuno'
+
+
+def row_props(row):
+    return {'text': row.title, 'id': f'row-{row.pk}'}
+
+
+def list_page(queryset, chunk_size):
+    rows = list(queryset)
+    html = ''.join(registry['button'](**row_props(row)).render() for row in rows)
+    return HttpResponse('<table>' + html + '</table>')
+
+
+def stream_page(queryset, chunk_size):
+    return stream_components(queryset, 'button', row_props, chunk_size=chunk_size,
+                             before='<table>', after='</table>')
+
+
+def consume(response) -> int:
+    size = 0
+    for chunk in response:
+        size += len(chunk)
+    response.close()
+    return size
+
+
+def run(page, rows: int, chunk_size: int):
+    queryset = Row.objects.order_by('pk')
+    start = time.perf_counter()
+    size = consume(page(queryset, chunk_size))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    consume(page(Row.objects.order_by('pk'), chunk_size))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows / elapsed, peak / 2 ** 20, size / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    with connection.schema_editor() as editor:
+        editor.create_model(Row)
+    Row.objects.bulk_create((Row(title=f'Row {i}') for i in range(args.rows)), batch_size=5000)
+    registry['button'].partial()
+
+    print(f"{args.rows} rows, chunk size {args.chunk_size}")
+    print(f"{'':<8}{'rows/s':>10}{'peak MiB':>10}{'body MiB':>10}")
+    for name, page in (('list', list_page), ('stream', stream_page)):
+        rate, peak, size = run(page, args.rows, args.chunk_size)
+        print(f"{name:<8}{rate:>10.0f}{peak:>10.1f}{size:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
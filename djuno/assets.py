@@ -0,0 +1,57 @@
+import contextvars
+import os
+import re
+from typing import Iterable, List, Optional, Set
+
+current_usage: contextvars.ContextVar = contextvars.ContextVar(
+    'djuno_usage', default=None)
+
+STATIC_REF_RE = re.compile(r'(?:href|src)="(/static/[^"#?{]+)')
+PRELOAD_AS = {
+    '.css': 'style',
+    '.js': 'script',
+    '.svg': 'image',
+    '.png': 'image',
+    '.webp': 'image',
+    '.woff2': 'font',
+}
+
+
+def track_component(name: str):
+    """Record that ``name`` rendered during the current request, if tracked."""
+    usage: Optional[Set[str]] = current_usage.get()
+    if usage is not None:
+        usage.add(name)
+
+
+def preload_link(url: str, as_: str = None) -> str:
+    if as_ is None:
+        as_ = PRELOAD_AS.get(os.path.splitext(url)[1], 'fetch')
+    link = f'<{url}>; rel=preload; as={as_}'
+    if as_ == 'font':
+        link += '; crossorigin'
+    return link
+
+
+def component_links(names: Iterable[str]) -> List[str]:
+    """``Link`` header values for the assets the named components need.
+
+    Covers the Vite bundles from the manifest (stylesheets, entry scripts
+    and their import chain as modulepreload) and static files referenced
+    directly from component templates, such as the icon sprite.
+    """
+    from .manifest import get_manifest
+    from .registry import registry
+    from .templatetags.djuno import entry_keys, vite_url
+
+    names = sorted(name for name in names if name in registry.file_paths)
+    assets = get_manifest().assets(entry_keys(names))
+    links = [preload_link(vite_url(f), 'style') for f in assets['css']]
+    links += [f'<{vite_url(f)}>; rel=modulepreload'
+              for f in assets['scripts'] + assets['preloads']]
+    for name in names:
+        for url in STATIC_REF_RE.findall(registry[name].template):
+            link = preload_link(url)
+            if link not in links:
+                links.append(link)
+    return links
@@ -0,0 +1,104 @@
+import json
+import re
+import statistics
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Type
+
+from .component import Component
+
+BUDGET_KEYS = ('max_render_ms', 'max_bytes', 'max_css_bytes', 'max_depth')
+MEASUREMENTS = {
+    'max_render_ms': 'render_ms',
+    'max_bytes': 'bytes',
+    'max_css_bytes': 'css_bytes',
+    'max_depth': 'depth',
+}
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'source', 'track', 'wbr',
+}
+STORY_RE = re.compile(
+    r'export const (\w+)\s*:\s*Story\s*=\s*{\s*args:\s*{(.*?)}\s*}', re.DOTALL)
+ARG_RE = re.compile(r'''(\w+)\s*:\s*('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|true|false|null|-?[\d.]+)''')
+
+
+class DepthParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.depth = 0
+        self.max_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+
+    def handle_startendtag(self, tag, attrs):
+        self.max_depth = max(self.max_depth, self.depth + 1)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS:
+            self.depth = max(self.depth - 1, 0)
+
+
+def html_depth(html: str) -> int:
+    """Deepest element nesting in a fragment of rendered HTML."""
+    parser = DepthParser()
+    parser.feed(html)
+    parser.close()
+    return parser.max_depth
+
+
+def story_args(stories_path: str) -> List[Dict[str, Any]]:
+    """``args`` of every story in a ``*.stories.ts`` file."""
+    try:
+        source = Path(stories_path).read_text()
+    except OSError:
+        return []
+    stories = []
+    for _, body in STORY_RE.findall(source):
+        args = {}
+        for key, raw in ARG_RE.findall(body):
+            if raw[0] in '\'"':
+                args[key] = raw[1:-1]
+            else:
+                args[key] = json.loads(raw)
+        stories.append(args)
+    return stories
+
+
+def split_slots(component: Type[Component], args: Dict[str, Any]):
+    """Story args that aren't props are slot contents."""
+    props = {k: v for k, v in args.items() if k in component.props}
+    slots = {k: v for k, v in args.items() if k not in component.props}
+    return props, slots or None
+
+
+def measure(component: Type[Component], cases: List[Dict[str, Any]], runs: int = 20) -> Dict[str, float]:
+    """Worst case over ``cases`` of median render time, bytes and depth."""
+    result = {'render_ms': 0.0, 'bytes': 0, 'css_bytes': len(
+        component.css.encode('utf-8')), 'depth': 0}
+    for args in cases or [{}]:
+        props, slots = split_slots(component, args)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            html = component(slots=slots, **props).render()
+            timings.append((time.perf_counter() - start) * 1000)
+        result['render_ms'] = max(
+            result['render_ms'], statistics.median(timings))
+        result['bytes'] = max(result['bytes'], len(html.encode('utf-8')))
+        result['depth'] = max(result['depth'], html_depth(html))
+    return result
+
+
+def check_budget(budget: Dict[str, float], measured: Dict[str, float]) -> List[str]:
+    """Human readable violations of ``budget``; empty when within it."""
+    violations = []
+    for key in BUDGET_KEYS:
+        if key in budget and measured[MEASUREMENTS[key]] > budget[key]:
+            violations.append(
+                f"{MEASUREMENTS[key]} {measured[MEASUREMENTS[key]]:g} > {key} {budget[key]:g}")
+    return violations
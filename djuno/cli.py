@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 import subprocess
 import ast
+import json
 
 
 def find_settings_path(project_name):
@@ -99,6 +100,17 @@ def check_settings(project_name):
     return results, instructions
 
 
+def setup_django(settings_module):
+    """Boot Django for commands that render components."""
+    import django
+
+    if settings_module:
+        os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                          f"{os.path.basename(os.getcwd())}.settings")
+    django.setup()
+
+
 @click.group()
 def cli():
     pass
@@ -122,8 +134,8 @@ def init(name):
 
     # Check if directory exists
     if Path(name).exists():
-        click.echo(f"❌ Directory '{
-                   name}' already exists. Choose a different name.")
+        click.echo(
+            f"❌ Directory '{name}' already exists. Choose a different name.")
         return
 
     # Create Django project
@@ -196,7 +208,7 @@ def init(name):
           return `x-data="{ isClicked: ${this.isClicked} }" @click="isClicked = !isClicked" :class="{ 'bg-blue-500 text-white': isClicked }"`;
         }
         if (this.js === 'htmx') {
-          return 'hx-post="/toggle/" hx-swap="outerHTML"';
+          return `hx-post="/djuno/components/button/" hx-vals='${JSON.stringify(this.$props)}' hx-swap="outerHTML"`;
         }
         return '';
       }
@@ -229,13 +241,18 @@ def init(name):
     click.echo("Next steps:")
     click.echo(f"  1. cd {name}")
     click.echo("  2. pip install djuno")
-    click.echo("  3. python manage.py runserver")
+    click.echo("  3. Add path('djuno/', include('djuno.urls')) to your urls.py")
+    click.echo("  4. python manage.py runserver")
     click.echo(
-        "  4. Use components: {% load djuno %}<button_component text=\"Click Me\"></button_component>")
+        "  5. Use components: {% load djuno %}<button_component text=\"Click Me\"></button_component>")
 
 
 @cli.command()
-def check():
+@click.option('--budget', is_flag=True, help='Also enforce per-component performance budgets')
+@click.option('--fixtures', default='djuno_budgets.json', help='JSON file of per-component props and budget overrides')
+@click.option('--dir', default='components', help='Directory containing components')
+@click.option('--settings', default=None, help='Django settings module')
+def check(budget, fixtures, dir, settings):
     """Check Django settings for Djuno compatibility."""
     click.echo("🔍 Checking Django settings...")
     project_name = os.path.basename(os.getcwd())
@@ -259,6 +276,52 @@ def check():
     else:
         click.echo("\n🎉 All settings are configured correctly!")
 
+    if budget and not check_budgets(fixtures, dir, settings):
+        raise SystemExit(1)
+
+
+def check_budgets(fixtures_path, dir, settings):
+    """Render every component against its budget. Returns False on any violation."""
+    from .budget import check_budget, measure, story_args
+    from .registry import ComponentRegistry
+
+    setup_django(settings)
+    try:
+        with open(fixtures_path) as f:
+            fixtures = json.load(f)
+    except FileNotFoundError:
+        fixtures = {}
+
+    registry = ComponentRegistry(dir)
+    click.echo("\n⏱️  Performance budgets:")
+    ok = True
+    for name, file_path in sorted(registry.file_paths.items()):
+        component = registry[name]
+        fixture = fixtures.get(name, {})
+        limits = {**component.budget, **fixture.get('budget', {})}
+        if not limits:
+            click.echo(f"  ➖ {name}: no budget declared")
+            continue
+        cases = fixture.get('props') or story_args(
+            str(Path(file_path).with_suffix('.stories.ts')))
+        try:
+            measured = measure(component, cases)
+        except Exception as e:
+            click.echo(f"  ❌ {name}: render failed: {e}")
+            ok = False
+            continue
+        violations = check_budget(limits, measured)
+        summary = (f"{measured['render_ms']:.2f}ms, {measured['bytes']}B, "
+                   f"css {measured['css_bytes']}B, depth {measured['depth']}")
+        if violations:
+            ok = False
+            click.echo(f"  ❌ {name}: {summary}")
+            for violation in violations:
+                click.echo(f"      {violation}")
+        else:
+            click.echo(f"  ✅ {name}: {summary}")
+    return ok
+
 
 @cli.command()
 @click.argument('name')
@@ -289,6 +352,241 @@ def add(name, template, js, dir):
     click.echo("🔍 Run `djuno check` to verify settings.")
 
 
+@cli.command('build-store')
+@click.option('--dir', default='components', help='Directory containing components')
+@click.option('--output', default='djuno/cache/components.store', help='Path of the store file')
+def build_store(dir, output):
+    """Precompile all components into a memory-mappable store."""
+    from .store import build_store as write_components
+
+    file_paths = {Path(p).stem: str(p) for p in Path(dir).glob('*/*.dj')}
+    if not file_paths:
+        click.echo(f"❌ No components found in '{dir}'.")
+        return
+    size = write_components(file_paths, output)
+    click.echo(
+        f"✅ Stored {len(file_paths)} components in {output} ({size} bytes)")
+    click.echo(
+        "💡 Call registry.preload('" + output + "') before your server forks workers.")
+
+
+@cli.group()
+def cache():
+    """Inspect and manage the on-disk compile cache."""
+    pass
+
+
+@cache.command()
+@click.option('--dir', 'cache_dir', default='djuno/cache/components', help='Compile cache directory')
+def stats(cache_dir):
+    """Show compile cache size, entry count and hit rate."""
+    from .compile_cache import CompileCache
+
+    info = CompileCache(cache_dir).stats()
+    click.echo(f"📦 Compile cache: {cache_dir}")
+    click.echo(f"  Entries: {info['entries']} / {info['max_entries']}")
+    click.echo(f"  Size: {info['bytes']} / {info['max_bytes']} bytes")
+    click.echo(
+        f"  Hit rate: {info['hit_rate']:.1%} ({info['hits']} hits, {info['misses']} misses)")
+
+
+@cache.command()
+@click.option('--dir', 'cache_dir', default='djuno/cache/components', help='Compile cache directory')
+@click.option('--max-bytes', type=int, default=None, help='Byte budget to prune down to')
+@click.option('--max-entries', type=int, default=None, help='Entry budget to prune down to')
+def prune(cache_dir, max_bytes, max_entries):
+    """Evict least recently used entries until the cache fits its budget."""
+    from .compile_cache import CompileCache
+
+    removed = CompileCache(cache_dir).prune(max_bytes, max_entries)
+    click.echo(f"🧹 Removed {removed} cache entries.")
+
+
+@cache.command()
+@click.option('--dir', 'cache_dir', default='djuno/cache/components', help='Compile cache directory')
+def clear(cache_dir):
+    """Remove every compile cache entry."""
+    from .compile_cache import CompileCache
+
+    removed = CompileCache(cache_dir).clear()
+    click.echo(f"🧹 Cleared {removed} cache entries.")
+
+
+@cli.command('css')
+@click.option('--dir', default='components', help='Directory containing components')
+@click.option('--templates-dir', 'template_dirs', multiple=True, default=['templates'], help='Page template directory (repeatable)')
+@click.option('--output', default='static/djuno/utilities.css', help='Stylesheet to write')
+@click.option('--utilities', default=None, help='Dotted path to a UtilityTable (default: DJUNO_CSS_UTILITIES)')
+@click.option('--no-preflight', is_flag=True, help='Leave out the base style reset')
+def css(dir, template_dirs, output, utilities, no_preflight):
+    """Build a stylesheet with only the utility classes templates use."""
+    from .css import CssBuilder, load_table
+
+    builder = CssBuilder(load_table(utilities))
+    try:
+        stylesheet = builder.build(dir, template_dirs, preflight=not no_preflight)
+    except ValueError as e:
+        click.echo(f"❌ {e}")
+        raise SystemExit(1)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(stylesheet)
+    click.echo(
+        f"🎨 Wrote {output} ({len(stylesheet.encode('utf-8')) / 1024:.1f} KB), "
+        f"rescanned {len(builder.rescanned)} of {len(builder.files)} files")
+
+
+@cli.command('minify-report')
+@click.option('--dir', default='components', help='Directory containing components')
+def minify_report(dir):
+    """Report template bytes saved by compile-time minification."""
+    from .compiler import parse_dj_file
+    from .minify import minify_report as template_savings
+
+    total_original = total_minified = 0
+    click.echo(f"{'component':<24}{'original':>10}{'minified':>10}{'saved':>8}")
+    for dj_file in sorted(Path(dir).glob('*/*.dj')):
+        report = template_savings(parse_dj_file(str(dj_file), minify=False))
+        total_original += report['original']
+        total_minified += report['minified']
+        saved = report['saved'] / report['original'] if report['original'] else 0
+        click.echo(
+            f"{dj_file.stem:<24}{report['original']:>10}{report['minified']:>10}{saved:>8.1%}")
+    saved = (total_original - total_minified) / \
+        total_original if total_original else 0
+    click.echo(
+        f"{'total':<24}{total_original:>10}{total_minified:>10}{saved:>8.1%}")
+    click.echo("💡 Set DJUNO_MINIFY=1 to minify templates at compile time.")
+
+
+@cli.command('partial-report')
+@click.option('--settings', default=None, help='Django settings module')
+@click.option('--dir', default='components', help='Directory containing components')
+def partial_report(settings, dir):
+    """Report which components render from precomputed prop variants."""
+    setup_django(settings)
+    from .compiler import parse_dj_file
+    from .component import from_sections
+
+    complete = variants = 0
+    dj_files = sorted(Path(dir).glob('*/*.dj'))
+    click.echo(f"{'component':<24}{'variants':>10}{'holes':>8}  key")
+    for dj_file in dj_files:
+        partial = from_sections(dj_file.stem, parse_dj_file(str(dj_file))).partial()
+        key = ', '.join(list(partial.dims) + [f'{bit}?' for bit in partial.bits])
+        click.echo(
+            f"{dj_file.stem:<24}{len(partial.variants):>10}{partial.holes:>8}  {key or '-'}"
+            + ('' if partial.complete else '  (partial)'))
+        complete += partial.complete
+        variants += len(partial.variants)
+    click.echo(f"✅ {complete} of {len(dj_files)} components fully precomputed, {variants} variants in total")
+    click.echo("💡 Props with choices or bool type become variant keys; set DJUNO_MAX_VARIANTS to cap them.")
+
+
+@cli.command('prerender')
+@click.option('--url', 'urls', multiple=True, help='URL to render through Django (repeatable)')
+@click.option('--template', 'templates', multiple=True, help='Template to render (repeatable)')
+@click.option('--component', default=None, help='Component to render for every prop combination')
+@click.option('--prop', 'props', multiple=True, help='Prop values as name=a,b,c or name=@static/icons.svg')
+@click.option('--output', default='static/prerender', help='Output directory')
+@click.option('--jobs', type=int, default=None, help='Parallel render processes')
+@click.option('--force', is_flag=True, help='Re-render outputs whose tracked sources are unchanged (e.g. after view or data changes)')
+@click.option('--settings', default=None, help='Django settings module')
+@click.option('--dir', default='components', help='Directory containing components')
+@click.option('--templates-dir', 'template_dirs', multiple=True, default=['templates'], help='Page template directory (repeatable)')
+def prerender_command(urls, templates, component, props, output, jobs, force, settings, dir, template_dirs):
+    """Prerender pages and components to static HTML files."""
+    from .graph import DependencyGraph
+    from .prerender import component_targets, parse_prop_values, prerender, template_targets, url_targets
+
+    setup_django(settings)
+    targets = url_targets(list(urls)) + template_targets(list(templates))
+    if component:
+        prop_values = {}
+        for spec in props:
+            key, _, values = spec.partition('=')
+            prop_values[key] = parse_prop_values(values)
+        targets += component_targets(component, prop_values)
+    if not targets:
+        click.echo("❌ Nothing to prerender. Pass --url, --template or --component.")
+        return
+
+    file_paths = {Path(p).stem: str(p) for p in Path(dir).glob('*/*.dj')}
+    graph = DependencyGraph()
+    graph.update(file_paths, template_dirs)
+    graph.save()
+    result = prerender(targets, output, file_paths, jobs=jobs, force=force,
+                       settings_module=os.environ['DJANGO_SETTINGS_MODULE'], graph=graph)
+    click.echo(
+        f"✅ Rendered {len(result['rendered'])}, skipped {len(result['skipped'])} unchanged.")
+    for failure in result['failed']:
+        click.echo(f"  ❌ {failure}")
+    click.echo(f"💡 Serve {output} with the URL map in {output}/nginx.map, e.g.")
+    click.echo(
+        f"      map $uri $djuno_prerender {{ include {output}/nginx.map; }}")
+
+
+@cli.command()
+@click.argument('name')
+@click.option('--dir', default='components', help='Directory containing components')
+@click.option('--templates-dir', 'template_dirs', multiple=True, default=['templates'], help='Page template directory (repeatable)')
+def graph(name, dir, template_dirs):
+    """Show what a component uses and what a change to it invalidates."""
+    from .graph import DependencyGraph
+
+    file_paths = {Path(p).stem: str(p) for p in Path(dir).glob('*/*.dj')}
+    deps = DependencyGraph()
+    deps.update(file_paths, template_dirs)
+    deps.save()
+    if name not in deps.nodes:
+        click.echo(f"❌ '{name}' is not a known component or template.")
+        return
+
+    click.echo(f"🔗 {name}")
+    click.echo(f"  Uses: {', '.join(sorted(deps.dependencies(name))) or '-'}")
+    used_by = [node for node, entry in deps.nodes.items()
+               if name in entry['uses']]
+    click.echo(f"  Used by: {', '.join(sorted(used_by)) or '-'}")
+    click.echo(f"  Invalidates: {', '.join(sorted(deps.invalidated_by(name)))}")
+
+
+@cli.command()
+@click.option('--perf', is_flag=True, help='Audit runtime configuration for production performance')
+@click.option('--settings', default=None, help='Django settings module')
+@click.option('--dir', default='components', help='Directory containing components')
+def doctor(perf, settings, dir):
+    """Diagnose common Djuno misconfigurations."""
+    if not perf:
+        click.echo("💡 Run `djuno doctor --perf` to audit production performance.")
+        return
+
+    # Auditing shouldn't start the live-reload file watcher.
+    djuno_env = os.environ.pop('DJUNO_ENV', None)
+    setup_django(settings)
+    from .doctor import audit
+    from .registry import ComponentRegistry
+
+    click.echo("🩺 Auditing runtime configuration...")
+    report = audit(ComponentRegistry(dir), djuno_env)
+
+    if report['findings']:
+        click.echo("\n📋 Findings (most expensive first):")
+        for i, item in enumerate(report['findings'], 1):
+            cost = 'blocks startup' if item['cost_ms'] == float(
+                'inf') else f"~{item['cost_ms']:.1f}ms"
+            click.echo(f"  {i}. ❌ {item['title']} ({cost})")
+            click.echo(f"      {item['detail']}")
+    else:
+        click.echo("\n🎉 No configuration problems found.")
+
+    click.echo("\n⏱️  Component renders (cold = compile + render):")
+    for timing in sorted(report['renders'], key=lambda t: t.get('cold_ms', 0), reverse=True):
+        if 'error' in timing:
+            click.echo(f"  ❌ {timing['name']}: {timing['error']}")
+        else:
+            click.echo(
+                f"  {timing['name']:<20} cold {timing['cold_ms']:8.2f}ms   warm {timing['warm_ms']:8.3f}ms")
+
+
 @cli.command()
 def docs():
     """Display Djuno documentation."""
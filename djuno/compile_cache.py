@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = 'djuno/cache/components'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 2000
+
+logger = logging.getLogger(__name__)
+
+
+class CompileCache:
+    """On-disk pickle cache of compiled .dj sections with LRU eviction.
+
+    Entries are keyed by the source file hash. Reading an entry bumps its
+    mtime, and every write evicts the least recently used entries until
+    the cache fits both ``max_bytes`` and ``max_entries``. Hit and miss
+    counters are kept in ``stats.json`` next to the entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv('DJUNO_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv('DJUNO_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.stats_lock = threading.Lock()
+
+    @property
+    def stats_file(self) -> Path:
+        return self.cache_dir / 'stats.json'
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.record('misses')
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.record('hits')
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store ``value``; an unwritable cache dir is logged and skipped."""
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f)
+            os.replace(tmp_path, self.path(key))
+            self.prune()
+        except OSError as e:
+            logger.warning(f"Compile cache {self.cache_dir} is not writable, not caching: {e}")
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def entries(self):
+        """Cache entries as (mtime, size, path), least recently used first."""
+        try:
+            scan = list(os.scandir(self.cache_dir))
+        except OSError:
+            return []
+        entries = []
+        for entry in scan:
+            if entry.name.endswith('.pkl'):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        entries.sort()
+        return entries
+
+    def prune(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None) -> int:
+        """Evict LRU entries until the budgets are met. Returns the count removed."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_entries = self.max_entries if max_entries is None else max_entries
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes and len(entries) - removed <= max_entries:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                break
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for _, _, path in entries:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self.stats_file.unlink()
+        except FileNotFoundError:
+            pass
+        return len(entries)
+
+    def read_counters(self) -> Dict[str, int]:
+        try:
+            with open(self.stats_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0}
+
+    def record(self, counter: str):
+        with self.stats_lock:
+            counters = self.read_counters()
+            counters[counter] = counters.get(counter, 0) + 1
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(counters, f)
+                os.replace(tmp_path, self.stats_file)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries()
+        counters = self.read_counters()
+        lookups = counters.get('hits', 0) + counters.get('misses', 0)
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+            'hit_rate': counters.get('hits', 0) / lookups if lookups else 0.0,
+        }
@@ -1,22 +1,62 @@
 from lxml import etree
-from typing import Dict
-import pickle
+from typing import Dict, Optional
 import hashlib
+import os
+import re
 from pathlib import Path
 import logging
+from .compile_cache import CompileCache
+from .minify import minify_template
+from .tracing import set_attribute, traced
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+compile_cache = CompileCache()
 
-def parse_dj_file(file_path: str, use_cache: bool = True) -> Dict[str, str]:
-    cache_dir = Path('djuno/cache/components')
-    file_hash = hashlib.md5(Path(file_path).read_bytes()).hexdigest()
-    cache_file = cache_dir / f"{file_hash}.pkl"
+# Bump whenever the compiled output changes so stale cache entries are skipped.
+COMPILER_VERSION = 5
 
-    if use_cache and cache_file.exists():
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
+TEMPLATE_TAG_RE = re.compile(r'<(/?)template\b[^>]*>')
+FALLBACK_RE = re.compile(r'<fallback>(.*?)</fallback>', re.DOTALL)
+
+
+def file_hash(file_path: str) -> str:
+    """Content hash of a .dj file, used as its compile cache key and version."""
+    return hashlib.md5(Path(file_path).read_bytes()).hexdigest()
+
+
+def cache_key(file_path: str, minify: bool = False) -> str:
+    return f"{file_hash(file_path)}.v{COMPILER_VERSION}" + ('.min' if minify else '')
+
+
+def extract_template(content: str) -> str:
+    """Raw source of the top-level <template> block, nested templates included."""
+    depth = 0
+    start = None
+    for match in TEMPLATE_TAG_RE.finditer(content):
+        if not match.group(1):
+            if depth == 0:
+                start = match.end()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                return content[start:match.start()].strip()
+    return ''
+
+
+@traced('djuno.parse', lambda file_path, *args, **kwargs: {'djuno.file': file_path})
+def parse_dj_file(file_path: str, use_cache: bool = True, minify: Optional[bool] = None) -> Dict[str, str]:
+    if minify is None:
+        minify = os.getenv('DJUNO_MINIFY') == '1'
+    key = cache_key(file_path, minify)
+
+    if use_cache:
+        sections = compile_cache.get(key)
+        set_attribute('djuno.cache_hit', sections is not None)
+        if sections is not None:
+            return sections
 
     with open(file_path, 'r') as f:
         content = f.read()
@@ -26,20 +66,27 @@ def parse_dj_file(file_path: str, use_cache: bool = True) -> Dict[str, str]:
     parser = etree.HTMLParser()
     tree = etree.fromstring(f'<root>{content}</root>', parser)
 
-    sections = {'template': '', 'style': '', 'script': ''}
-    for elem in tree:
+    sections = {'template': '', 'style': '', 'script': '', 'budget': '', 'fallback': ''}
+    for elem in tree.find('.//root'):
         tag = elem.tag
         if tag in sections:
             if tag == 'template':
-                sections[tag] = etree.tostring(
-                    elem, encoding='unicode').strip()[10:-11]
+                # Take the raw source: re-serializing through lxml mangles
+                # Django tags that sit inside HTML start tags.
+                sections[tag] = extract_template(content)
+            elif tag == 'fallback':
+                match = FALLBACK_RE.search(content)
+                sections[tag] = match.group(1).strip() if match else ''
             else:
                 sections[tag] = ''.join(elem.itertext()).strip()
 
+    if minify:
+        sections['template'] = minify_template(sections['template'])
+
     logger.debug(f"Parsed sections: {sections}")
 
     # Cache compiled sections
-    with open(cache_file, 'wb') as f:
-        pickle.dump(sections, f)
+    if use_cache:
+        compile_cache.set(key, sections)
 
     return sections
@@ -1,9 +1,43 @@
-from django import template
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+from functools import lru_cache
 from typing import Dict, Any, Optional, Type, Union
-from .compiler import parse_dj_file
-from .registry import register_component
+from .compiler import parse_dj_file, file_hash
+from .assets import track_component
+from . import live
+from .deadline import arender_with_deadline, render_with_deadline
+from .donut import current_capture
+from .partial import PartialTemplate, build_partial
+from .render_context import current_render
+from .tracing import traced
 from pathlib import Path
 
+TRUE_VALUES = ('1', 'true', 'on', 'yes')
+LAZY_SALT = 'djuno.lazy'
+DEFAULT_LAZY_TOKEN_MAX_AGE = 24 * 60 * 60
+DEFAULT_LAZY_TOKEN_MAX_BYTES = 4096
+
+
+def lazy_salt(name: str) -> str:
+    """Signing salt of ``name``'s lazy tokens, so a token only loads that component."""
+    return f'{LAZY_SALT}:{name}'
+
+
+def load_lazy_token(name: str, token: str) -> Dict[str, Any]:
+    """Props and slots from a token minted for component ``name``.
+
+    Raises ``signing.BadSignature`` for tampered tokens, tokens minted for
+    another component, and tokens older than DJUNO_LAZY_TOKEN_MAX_AGE
+    seconds (default one day).
+    """
+    max_age = getattr(settings, 'DJUNO_LAZY_TOKEN_MAX_AGE', DEFAULT_LAZY_TOKEN_MAX_AGE)
+    return signing.loads(token, salt=lazy_salt(name), max_age=max_age)
+
 
 class Prop:
     def __init__(
@@ -27,21 +61,103 @@ class Prop:
             return self.type_(value)
         return self.default
 
+    def domain(self) -> Optional[list]:
+        """Every value ``validate`` can return, or None if unbounded."""
+        if self.choices:
+            values = [self.type_(choice) for choice in self.choices]
+        elif self.type_ is bool:
+            values = [False, True]
+        else:
+            return None
+        if self.default not in values:
+            values.append(self.default)
+        return values
+
+
+class PropsView:
+    """Read-only access to just the props a computed property declared."""
+
+    def __init__(self, values: Dict[str, Any]):
+        self.__dict__.update(values)
+
+
+class computed:
+    """Server-side computed property, memoized on its prop dependencies.
+
+    The function receives a view exposing only the declared props, so its
+    result can be shared by every instance with the same dependency values.
+    Results are kept in a per-property LRU cache of ``maxsize`` entries.
+
+        @computed(*props)
+        def js_attrs(self):
+            return 'hx-get="..."' if self.js == 'htmx' else ''
+    """
+
+    def __init__(self, *deps: str, maxsize: int = 256):
+        self.deps = deps
+        self.maxsize = maxsize
+
+    def __call__(self, func):
+        self.func = func
+        self.cached = lru_cache(maxsize=self.maxsize)(self.compute)
+        return self
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        owner.computed_props = {**owner.computed_props, name: self}
+
+    def compute(self, *values):
+        return self.func(PropsView(dict(zip(self.deps, values))))
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = tuple(instance.kwargs.get(dep) for dep in self.deps)
+        try:
+            return self.cached(*values)
+        except TypeError:
+            # Unhashable prop values can't be memoized.
+            return self.compute(*values)
+
 
 class Component:
+    name: str = ''
     props: Dict[str, Prop] = {}
     template: str = ''
     styles: Dict[str, str] = {}
     scripts: str = ''
     slots: Dict[str, str] = {}
+    version: str = ''
+    placeholder: str = ''
+    css: str = ''
+    budget: Dict[str, float] = {}
+    computed_props: Dict[str, computed] = {}
+    deadline_ms: Optional[float] = None
+    deadline_lazy: bool = False
 
     def __init__(self, slots: Dict[str, str] = None, **kwargs):
         self.kwargs = {}
         self.slots = slots or {'default': ''}
+        lazy = kwargs.get('lazy', False)
+        self.lazy = lazy is True or str(lazy).lower() in TRUE_VALUES
+        self.hole = kwargs.get('hole')
+        deadline = kwargs.get('deadline', self.deadline_ms)
+        if deadline is None:
+            deadline = getattr(settings, 'DJUNO_RENDER_DEADLINE_MS', None)
+        self.deadline_ms = float(deadline) if deadline not in (None, '') else None
         for key, prop in self.props.items():
             value = kwargs.get(key)
             self.kwargs[key] = prop.validate(value, key)
 
+    @classmethod
+    def partial(cls) -> PartialTemplate:
+        """The class's partially evaluated template, built on first use."""
+        partial = cls.__dict__.get('partial_template')
+        if partial is None:
+            partial = build_partial(cls)
+            cls.partial_template = partial
+        return partial
+
     def get_context_data(self) -> Dict[str, Any]:
         context = {
             'id': self.kwargs.get('id'),
@@ -50,6 +166,8 @@ class Component:
             'hydration': self.get_hydration_data(),
             **self.kwargs
         }
+        for name in self.computed_props:
+            context[name] = getattr(self, name)
         for slot_name, slot_content in self.slots.items():
             context[slot_name] = slot_content
         return context
@@ -59,20 +177,111 @@ class Component:
             return '<script>document.addEventListener("alpine:init", () => { Alpine.hydrate(this); });</script>'
         return ''
 
+    def get_lazy_token(self) -> str:
+        """Signed token carrying this instance's props and slots, bound to its name."""
+        return signing.dumps({'props': self.kwargs, 'slots': self.slots},
+                             salt=lazy_salt(self.name), compress=True)
+
+    def render_placeholder(self) -> str:
+        """Placeholder that HTMX swaps for the real render once it scrolls into view.
+
+        The token, slot HTML included, travels in the query string, so it
+        is rejected with ``ValueError`` past DJUNO_LAZY_TOKEN_MAX_BYTES
+        (default 4096) rather than hitting a server's URL length limit.
+        """
+        token = self.get_lazy_token()
+        max_bytes = getattr(settings, 'DJUNO_LAZY_TOKEN_MAX_BYTES', DEFAULT_LAZY_TOKEN_MAX_BYTES)
+        if len(token) > max_bytes:
+            raise ValueError(
+                f"Lazy token for '{self.name}' is {len(token)} bytes, over "
+                f"DJUNO_LAZY_TOKEN_MAX_BYTES={max_bytes}; pass smaller slots or render it eagerly")
+        url = reverse('djuno-component', args=[self.name])
+        return (
+            f'<div hx-get="{url}?token={escape(token)}" '
+            f'hx-trigger="revealed" hx-swap="outerHTML">{self.placeholder}</div>'
+        )
+
+    @traced(
+        'djuno.render',
+        lambda self: {'djuno.component': self.name,
+                      'djuno.props_count': len(self.kwargs)},
+        lambda html: {'djuno.bytes_out': len(html)}
+    )
     def render(self) -> str:
-        t = template.Template(self.template)
-        c = template.Context(self.get_context_data())
-        return t.render(c)
+        track_component(self.name)
+        render = current_render.get()
+        if render is not None:
+            render.use(self)
+        if self.hole:
+            capture = current_capture.get()
+            if capture is not None:
+                return capture.add(self)
+        if self.lazy:
+            return self.render_placeholder()
+        key = render.key(self) if render is not None else None
+        if render is not None:
+            html = render.get(key)
+            if html is not None:
+                return html
+        if self.deadline_ms is None:
+            html = self.render_content()
+        else:
+            html = render_with_deadline(self, self.deadline_ms)
+        if live.ENABLED:
+            html = live.wrap(self, html)
+        if render is not None:
+            render.add(self, key, html)
+        return html
 
+    async def arender(self) -> str:
+        """Render from async code; a deadline is awaited without blocking the loop."""
+        if self.lazy or self.hole or self.deadline_ms is None:
+            return await sync_to_async(self.render)()
+        track_component(self.name)
+        render = current_render.get()
+        if render is not None:
+            render.use(self)
+        key = render.key(self) if render is not None else None
+        if render is not None:
+            html = render.get(key)
+            if html is not None:
+                return html
+        html = await arender_with_deadline(self, self.deadline_ms)
+        if live.ENABLED:
+            html = live.wrap(self, html)
+        if render is not None:
+            render.add(self, key, html)
+        return html
 
-def from_dj_file(file_path: str) -> Type[Component]:
-    sections = parse_dj_file(file_path)
-    name = Path(file_path).stem
+    def render_content(self) -> str:
+        return self.partial().render(self.get_context_data(), set(self.slots))
+
+    def render_fallback(self) -> str:
+        """What a render that misses its deadline returns instead.
 
+        The ``<fallback>`` section, or with ``deadline_lazy`` in the budget,
+        a placeholder that loads the real render over HTMX once revealed
+        (unless its token is too large for a URL).
+        """
+        if self.deadline_lazy:
+            try:
+                return self.render_placeholder()
+            except ValueError:
+                pass
+        return mark_safe(self.placeholder)
+
+
+def from_sections(name: str, sections: Dict[str, str], version: str = '') -> Type[Component]:
+    """Build a component class from already compiled .dj sections."""
     class DynamicComponent(Component):
         template = sections['template']
         styles = {'default': f'{name}_default_abc123'}
         scripts = sections['script']
+        css = sections['style']
+        placeholder = sections.get('fallback', '')
+        budget = json.loads(sections.get('budget') or '{}')
+        deadline_ms = budget.get('deadline_ms')
+        deadline_lazy = budget.get('deadline_lazy', False)
 
         props = {
             'id': Prop(str, default=None),
@@ -84,5 +293,27 @@ def from_dj_file(file_path: str) -> Type[Component]:
             'icon': Prop(str, default=None)
         }
 
-    register_component(name, DynamicComponent)
+        @computed(*props)
+        def js_attrs(self):
+            if self.js == 'alpine':
+                return mark_safe('x-data="{ isClicked: false }" @click="isClicked = !isClicked" :class="{ \'bg-blue-500 text-white\': isClicked }"')
+            if self.js == 'htmx':
+                # Post the instance's props back to the component view, so the
+                # swap re-renders this button rather than a page-specific URL.
+                url = reverse('djuno-component', args=[name])
+                values = {key: value for key, value in vars(self).items() if value is not None}
+                return format_html('hx-post="{}" hx-vals="{}" hx-swap="outerHTML"',
+                                   url, json.dumps(values))
+            return ''
+
+    DynamicComponent.name = name
+    DynamicComponent.version = version
     return DynamicComponent
+
+
+@traced('djuno.compile', lambda file_path: {'djuno.component': Path(file_path).stem})
+def from_dj_file(file_path: str) -> Type[Component]:
+    """Compile a .dj file into a component class without registering it anywhere."""
+    sections = parse_dj_file(file_path)
+    name = Path(file_path).stem
+    return from_sections(name, sections, file_hash(file_path))
@@ -0,0 +1,432 @@
+import importlib
+import json
+import os
+import re
+from glob import glob
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .compiler import parse_dj_file
+
+DEFAULT_CACHE_PATH = 'djuno/cache/css.json'
+# Bump when scan results change shape or meaning, so cached entries are rescanned.
+SCAN_VERSION = 3
+# class="...", :class="..." and x-bind:class="...", and class='...' passed to component tags.
+CLASS_ATTR_RE = re.compile(r'''(?<![\w-])(?:x-bind:|:)?class\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+CANDIDATE_RE = re.compile(r"[^<>\"'`\s{}()]*[^<>\"'`\s{}():,;]")
+APPLY_RE = re.compile(r'@apply\s+([^;]+);')
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+PSEUDO_CLASSES = {
+    'hover': ':hover',
+    'focus': ':focus',
+    'active': ':active',
+    'disabled': ':disabled',
+    'focus-within': ':focus-within',
+    'first': ':first-child',
+    'last': ':last-child',
+}
+
+PREFLIGHT = '''*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}
+html{line-height:1.5;-webkit-text-size-adjust:100%;font-family:ui-sans-serif,system-ui,-apple-system,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif}
+body{margin:0;line-height:inherit}
+h1,h2,h3,h4,h5,h6,p,blockquote,figure,hr,pre{margin:0}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+ol,ul{list-style:none;margin:0;padding:0}
+a{color:inherit;text-decoration:inherit}
+button,input,optgroup,select,textarea{font-family:inherit;font-size:100%;line-height:inherit;color:inherit;margin:0;padding:0}
+button,[role="button"]{cursor:pointer;background-color:transparent;background-image:none}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+'''
+
+# Tailwind 2 default palette.
+COLORS = {
+    'black': '#000', 'white': '#fff', 'transparent': 'transparent', 'current': 'currentColor',
+}
+for color, shades in {
+    'gray': 'f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827',
+    'red': 'fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d',
+    'yellow': 'fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f',
+    'green': 'ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b',
+    'blue': 'eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a',
+    'indigo': 'eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81',
+    'purple': 'f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95',
+    'pink': 'fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843',
+}.items():
+    for shade, value in zip((50, 100, 200, 300, 400, 500, 600, 700, 800, 900), shades.split()):
+        COLORS[f'{color}-{shade}'] = f'#{value}'
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+}
+FONT_WEIGHTS = {
+    'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+    'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900,
+}
+RADII = {
+    'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+    'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px',
+}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgba(0,0,0,0.05)',
+    '': '0 1px 3px 0 rgba(0,0,0,0.1),0 1px 2px 0 rgba(0,0,0,0.06)',
+    'md': '0 4px 6px -1px rgba(0,0,0,0.1),0 2px 4px -1px rgba(0,0,0,0.06)',
+    'lg': '0 10px 15px -3px rgba(0,0,0,0.1),0 4px 6px -2px rgba(0,0,0,0.05)',
+    'none': '0 0 #0000',
+}
+SIDES = {
+    '': ('',), 'x': ('-left', '-right'), 'y': ('-top', '-bottom'),
+    't': ('-top',), 'r': ('-right',), 'b': ('-bottom',), 'l': ('-left',),
+}
+
+Declarations = Union[str, Callable[[re.Match], Optional[str]]]
+
+
+def spacing(value: str) -> Optional[str]:
+    """Tailwind spacing scale: ``4`` is 1rem, ``px`` is 1px."""
+    if value == 'px':
+        return '1px'
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if number < 0 or number * 2 != int(number * 2):
+        return None
+    return '0px' if number == 0 else f'{number / 4:g}rem'
+
+
+def size(value: str, viewport: str) -> Optional[str]:
+    if value == 'auto':
+        return 'auto'
+    if value == 'full':
+        return '100%'
+    if value == 'screen':
+        return f'100{viewport}'
+    if '/' in value:
+        numerator, _, denominator = value.partition('/')
+        if numerator.isdigit() and denominator.isdigit() and int(denominator):
+            return f'{int(numerator) / int(denominator) * 100:g}%'
+        return None
+    return spacing(value)
+
+
+class UtilityTable:
+    """Maps utility class names to CSS declarations.
+
+    Each rule is a regex matched against the whole class name (without
+    variant prefixes) and either a declaration string, which may use
+    ``\\1``-style group references, or a callable taking the match and
+    returning declarations or None. Rules are tried in order and their
+    order is also the order utilities appear in the stylesheet.
+
+        table = default_table.copy()
+        table.add(r'content-auto', 'content-visibility: auto')
+    """
+
+    def __init__(self):
+        self.rules: List[Tuple[re.Pattern, Declarations]] = []
+
+    def add(self, pattern: str, declarations: Declarations):
+        self.rules.append((re.compile(pattern), declarations))
+
+    def rule(self, pattern: str):
+        """Decorator form of ``add`` for callable rules."""
+        def decorator(func):
+            self.add(pattern, func)
+            return func
+        return decorator
+
+    def copy(self) -> 'UtilityTable':
+        table = UtilityTable()
+        table.rules = list(self.rules)
+        return table
+
+    def resolve(self, name: str) -> Optional[Tuple[int, str]]:
+        """``(rule index, declarations)`` for a utility, or None if unknown."""
+        for index, (pattern, declarations) in enumerate(self.rules):
+            match = pattern.fullmatch(name)
+            if match is None:
+                continue
+            result = declarations(match) if callable(declarations) else match.expand(declarations)
+            if result is not None:
+                return index, result
+        return None
+
+
+default_table = UtilityTable()
+for display in ('block', 'inline-block', 'inline', 'flex', 'inline-flex', 'grid', 'inline-grid', 'table', 'contents'):
+    default_table.add(display, f'display: {display}')
+default_table.add('hidden', 'display: none')
+for position in ('static', 'fixed', 'absolute', 'relative', 'sticky'):
+    default_table.add(position, f'position: {position}')
+default_table.add(r'flex-(row|col)(-reverse)?',
+                  lambda m: f"flex-direction: {'row' if m[1] == 'row' else 'column'}{m[2] or ''}")
+default_table.add(r'flex-(wrap|nowrap|wrap-reverse)', r'flex-wrap: \1')
+default_table.add('flex-1', 'flex: 1 1 0%')
+default_table.add('flex-auto', 'flex: 1 1 auto')
+default_table.add('flex-none', 'flex: none')
+default_table.add(r'items-(start|end)', r'align-items: flex-\1')
+default_table.add(r'items-(center|baseline|stretch)', r'align-items: \1')
+default_table.add(r'justify-(start|end)', r'justify-content: flex-\1')
+default_table.add(r'justify-center', 'justify-content: center')
+default_table.add(r'justify-(between|around|evenly)', r'justify-content: space-\1')
+default_table.add(r'grid-cols-(\d+)', r'grid-template-columns: repeat(\1, minmax(0, 1fr))')
+
+
+@default_table.rule(r'gap-([\w.]+)')
+def gap(match):
+    value = spacing(match[1])
+    return value and f'gap: {value}'
+
+
+@default_table.rule(r'(-?)(p|m)([xytrbl]?)-([\w.]+)')
+def box_spacing(match):
+    negative, kind, side, value = match.groups()
+    value = 'auto' if kind == 'm' and value == 'auto' and not negative else spacing(value)
+    if value is None or (negative and kind == 'p'):
+        return None
+    if negative and value != '0px':
+        value = f'-{value}'
+    prop = 'padding' if kind == 'p' else 'margin'
+    return '; '.join(f'{prop}{suffix}: {value}' for suffix in SIDES[side])
+
+
+@default_table.rule(r'space-(x|y)-([\w.]+)')
+def space_between(match):
+    value = spacing(match[2])
+    side = 'left' if match[1] == 'x' else 'top'
+    return value and f'margin-{side}: {value}'
+
+
+@default_table.rule(r'(min-|max-)?(w|h)-([\w./]+)')
+def dimension(match):
+    bound, axis, value = match.groups()
+    value = size(value, 'vw' if axis == 'w' else 'vh')
+    prop = 'width' if axis == 'w' else 'height'
+    return value and f'{bound or ""}{prop}: {value}'
+
+
+@default_table.rule(r'text-(\w+)')
+def font_size(match):
+    if match[1] not in FONT_SIZES:
+        return None
+    font, line_height = FONT_SIZES[match[1]]
+    return f'font-size: {font}; line-height: {line_height}'
+
+
+@default_table.rule(r'font-(\w+)')
+def font_weight(match):
+    weight = FONT_WEIGHTS.get(match[1])
+    return weight and f'font-weight: {weight}'
+
+
+default_table.add(r'text-(left|center|right|justify)', r'text-align: \1')
+default_table.add('underline', 'text-decoration: underline')
+default_table.add('no-underline', 'text-decoration: none')
+default_table.add('uppercase', 'text-transform: uppercase')
+default_table.add('truncate', 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap')
+
+
+@default_table.rule(r'(bg|text|border)-([\w-]+)')
+def color(match):
+    value = COLORS.get(match[2])
+    prop = {'bg': 'background-color', 'text': 'color', 'border': 'border-color'}[match[1]]
+    return value and f'{prop}: {value}'
+
+
+default_table.add('border', 'border-width: 1px')
+default_table.add(r'border-(0|2|4|8)', r'border-width: \1px')
+
+
+@default_table.rule(r'rounded(?:-(\w+))?')
+def rounded(match):
+    value = RADII.get(match[1] or '')
+    return value and f'border-radius: {value}'
+
+
+@default_table.rule(r'shadow(?:-(\w+))?')
+def shadow(match):
+    value = SHADOWS.get(match[1] or '')
+    return value and f'box-shadow: {value}'
+
+
+@default_table.rule(r'opacity-(\d+)')
+def opacity(match):
+    value = int(match[1])
+    return f'opacity: {value / 100:g}' if value <= 100 and value % 5 == 0 else None
+
+
+default_table.add(r'cursor-(auto|default|pointer|wait|text|move|not-allowed)', r'cursor: \1')
+default_table.add(r'overflow-(auto|hidden|visible|scroll)', r'overflow: \1')
+default_table.add('transition',
+                  'transition-property: background-color, border-color, color, fill, stroke, opacity, box-shadow, transform; '
+                  'transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); transition-duration: 150ms')
+default_table.add('transition-none', 'transition-property: none')
+default_table.add(r'duration-(\d+)', r'transition-duration: \1ms')
+default_table.add('fill-current', 'fill: currentColor')
+default_table.add(r'z-(0|10|20|30|40|50)', r'z-index: \1')
+
+
+def load_table(path: Optional[str] = None) -> UtilityTable:
+    """The utility table at dotted ``path`` (``module.attr``), or the default one.
+
+    Defaults to the DJUNO_CSS_UTILITIES environment variable.
+    """
+    path = path or os.getenv('DJUNO_CSS_UTILITIES')
+    if not path:
+        return default_table
+    module, _, attr = path.rpartition('.')
+    return getattr(importlib.import_module(module), attr)
+
+
+def escape_class(name: str) -> str:
+    return re.sub(r'([^\w-])', r'\\\1', name)
+
+
+def split_variants(token: str) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+    """``(screen, pseudo class, utility)`` of a class token, or None if a prefix is unknown."""
+    *prefixes, utility = token.split(':')
+    screen = pseudo = None
+    for prefix in prefixes:
+        if prefix in SCREENS and screen is None and pseudo is None:
+            screen = prefix
+        elif prefix in PSEUDO_CLASSES and pseudo is None:
+            pseudo = prefix
+        else:
+            return None
+    return screen, pseudo, utility
+
+
+def extract_candidates(source: str) -> Set[str]:
+    """Tokens in ``source``'s ``class``/``:class``/``x-bind:class`` values that could be class names."""
+    tokens = set()
+    for double, single in CLASS_ATTR_RE.findall(source):
+        tokens.update(CANDIDATE_RE.findall(double or single))
+    return tokens
+
+
+def scope_css(css: str, styles: Dict[str, str]) -> str:
+    """Rewrite a component's class selectors to its scoped ``styles`` names.
+
+    ``.default`` becomes ``.button_default_abc123`` for a component whose
+    ``styles`` maps ``default`` to that. Classes missing from ``styles``
+    can't be scoped, since the markup refers to them as written, and stay
+    global.
+    """
+    for local, scoped in styles.items():
+        css = re.sub(rf'\.{re.escape(local)}(?![\w-])', f'.{scoped}', css)
+    return css
+
+
+def expand_apply(css: str, table: UtilityTable) -> str:
+    """Replace ``@apply`` directives in ``css`` with the utilities' declarations."""
+    def replace(match):
+        declarations = []
+        for name in match[1].split():
+            resolved = table.resolve(name)
+            if resolved is None:
+                raise ValueError(f"@apply: unknown utility '{name}'")
+            declarations.append(resolved[1])
+        return '; '.join(declarations) + ';'
+    return APPLY_RE.sub(replace, css)
+
+
+def generate(tokens: Iterable[str], table: UtilityTable) -> str:
+    """CSS rules for the ``tokens`` the table knows, in table order, screens last."""
+    rules = []
+    screens = list(SCREENS)
+    pseudos = list(PSEUDO_CLASSES)
+    for token in tokens:
+        variants = split_variants(token)
+        if variants is None:
+            continue
+        screen, pseudo, utility = variants
+        resolved = table.resolve(utility)
+        if resolved is None:
+            continue
+        index, declarations = resolved
+        selector = '.' + escape_class(token) + (PSEUDO_CLASSES[pseudo] if pseudo else '')
+        order = (screens.index(screen) + 1 if screen else 0, index,
+                 pseudos.index(pseudo) + 1 if pseudo else 0, token)
+        rules.append((order, screen, f'{selector}{{{declarations}}}'))
+    rules.sort()
+
+    lines = []
+    current = None
+    for _, screen, rule in rules:
+        if screen != current:
+            if current is not None:
+                lines.append('}')
+            if screen is not None:
+                lines.append(f'@media (min-width: {SCREENS[screen]}) {{')
+            current = screen
+        lines.append(rule)
+    if current is not None:
+        lines.append('}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+class CssBuilder:
+    """Builds a stylesheet with only the utilities component and page templates use.
+
+    Class candidates are scanned from the class attributes of compiled
+    component templates and scripts and of project templates. Component
+    ``<style>`` blocks are left out: the ``RenderContext`` inlines the
+    ones a page uses through ``{% djuno_assets 'css' %}``. Per-file
+    results are kept in ``cache_path`` with the file's mtime and size, so
+    a rebuild only rescans files that changed.
+    """
+
+    def __init__(self, table: Optional[UtilityTable] = None, cache_path: str = DEFAULT_CACHE_PATH):
+        self.table = table or default_table
+        self.cache_path = Path(cache_path)
+        self.files: Dict[str, Dict] = {}
+        self.rescanned: List[str] = []
+        try:
+            self.files = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            self.files = {}
+
+    def scan_file(self, path: str) -> Dict:
+        if path.endswith('.dj'):
+            sections = parse_dj_file(path)
+            return {'tokens': sorted(extract_candidates(sections['template'] + sections['script']))}
+        return {'tokens': sorted(extract_candidates(Path(path).read_text()))}
+
+    def scan(self, paths: Iterable[str]) -> Dict[str, Dict]:
+        """Per-file scan results for ``paths``, rescanning only changed files."""
+        scanned = {}
+        self.rescanned = []
+        for path in sorted(set(paths)):
+            stat = os.stat(path)
+            entry = self.files.get(path)
+            if (entry is None or entry.get('version') != SCAN_VERSION
+                    or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size):
+                entry = {'version': SCAN_VERSION, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                         **self.scan_file(path)}
+                self.rescanned.append(path)
+            scanned[path] = entry
+        self.files = scanned
+        return scanned
+
+    def save(self):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps(self.files))
+
+    def build(self, component_dir: str = 'components', template_dirs: Iterable[str] = ('templates',),
+              preflight: bool = True) -> str:
+        paths = glob(f'{component_dir}/*/*.dj')
+        for template_dir in template_dirs:
+            paths += glob(f'{template_dir}/**/*.html', recursive=True)
+        files = self.scan(paths)
+        self.save()
+
+        tokens = set()
+        for entry in files.values():
+            tokens.update(entry['tokens'])
+        parts = [PREFLIGHT] if preflight else []
+        parts.append(generate(tokens, self.table))
+        return ''.join(parts)
@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import Counter
+from concurrent import futures
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .tracing import set_attribute
+
+misses: Counter = Counter()
+lock = threading.Lock()
+executor: Optional[futures.ThreadPoolExecutor] = None
+worker = threading.local()
+
+
+def get_executor() -> futures.ThreadPoolExecutor:
+    """Shared pool for deadline-bound renders (DJUNO_DEADLINE_WORKERS, default 8)."""
+    global executor
+    with lock:
+        if executor is None:
+            executor = futures.ThreadPoolExecutor(
+                max_workers=getattr(settings, 'DJUNO_DEADLINE_WORKERS', 8),
+                thread_name_prefix='djuno-deadline',
+            )
+    return executor
+
+
+def record_miss(name: str):
+    with lock:
+        misses[name] += 1
+    set_attribute('djuno.deadline_exceeded', True)
+
+
+def stats() -> Dict[str, int]:
+    """Deadline misses per component since the process started."""
+    with lock:
+        return dict(misses)
+
+
+def in_worker() -> bool:
+    """Whether this thread is already rendering a deadline-bound component."""
+    return getattr(worker, 'active', False)
+
+
+def run_in_worker(component) -> str:
+    """``component.render_content()`` on a worker thread, with its own DB connection.
+
+    Like a request, the render starts and ends by closing the thread's
+    stale connections, so connections opened by lazy queries don't leak.
+    """
+    worker.active = True
+    close_old_connections()
+    try:
+        return component.render_content()
+    finally:
+        close_old_connections()
+        worker.active = False
+
+
+def render_with_deadline(component, deadline_ms: float) -> str:
+    """Render ``component`` in a worker thread, or its fallback after ``deadline_ms``.
+
+    The deadline runs from when a worker picks the render up, so time spent
+    queued behind other renders doesn't count against it; if no worker is
+    free within the deadline, the component renders on the calling thread
+    instead. Deadline components nested inside one render inline, so they
+    never wait on the pool their parent is holding.
+
+    Python can't interrupt a running render, so a render that misses its
+    deadline finishes in the background and its output is discarded.
+    Workers query through their own database connections: rows written
+    in the request's uncommitted transaction (an ``atomic`` block, or
+    ``ATOMIC_REQUESTS``) aren't visible to them.
+    """
+    if in_worker():
+        return component.render_content()
+    context = contextvars.copy_context()
+    started = threading.Event()
+    state = {}
+
+    def run():
+        state['start'] = time.perf_counter()
+        started.set()
+        return context.run(run_in_worker, component)
+
+    future = get_executor().submit(run)
+    if not started.wait(deadline_ms / 1000):
+        if future.cancel():
+            return component.render_content()
+        started.wait()
+    remaining = deadline_ms / 1000 - (time.perf_counter() - state['start'])
+    try:
+        return future.result(timeout=max(remaining, 0))
+    except futures.TimeoutError:
+        record_miss(component.name)
+        return component.render_fallback()
+
+
+async def arender_with_deadline(component, deadline_ms: float) -> str:
+    """``render_with_deadline`` for the event loop; waiting doesn't block it.
+
+    Renders run on the loop's default executor, and the deadline includes
+    any wait for one of its threads. The same database caveats apply.
+    """
+    render = sync_to_async(run_in_worker, thread_sensitive=False)
+    try:
+        return await asyncio.wait_for(render(component), deadline_ms / 1000)
+    except asyncio.TimeoutError:
+        record_miss(component.name)
+        return component.render_fallback()
@@ -0,0 +1,179 @@
+import logging
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from django.core import signing
+
+from .budget import split_slots, story_args
+from .compiler import compile_cache, parse_dj_file
+from .component import from_sections, lazy_salt
+
+CSS_PLUGINS = ('djuno.plugins.tailwind', 'djuno.plugins.postcss')
+
+
+def timed(func, runs: int = 1) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def finding(title: str, cost_ms: float, detail: str) -> Dict[str, Any]:
+    return {'title': title, 'cost_ms': cost_ms, 'detail': detail}
+
+
+def check_environment(djuno_env: str) -> List[Dict[str, Any]]:
+    if djuno_env != 'development':
+        return []
+    payload = {'props': {'text': 'Click Me'}, 'slots': {'default': ''}}
+    cost = timed(lambda: signing.dumps(
+        payload, salt=lazy_salt('button'), compress=True), runs=20)
+    return [finding(
+        'DJUNO_ENV=development is set',
+        cost,
+        'The registry runs a file watcher thread and every render signs a live-reload '
+        'token (cost shown is per render); unset DJUNO_ENV in production.'
+    )]
+
+
+def check_logging(registry) -> List[Dict[str, Any]]:
+    logger = logging.getLogger('djuno.compiler')
+    if not logger.isEnabledFor(logging.DEBUG) or not registry.file_paths:
+        return []
+    file_path = next(iter(registry.file_paths.values()))
+    with_debug = timed(lambda: parse_dj_file(
+        file_path, use_cache=False), runs=5)
+    logging.disable(logging.DEBUG)
+    try:
+        without_debug = timed(lambda: parse_dj_file(
+            file_path, use_cache=False), runs=5)
+    finally:
+        logging.disable(logging.NOTSET)
+    return [finding(
+        'DEBUG logging is enabled for djuno.compiler',
+        max(with_debug - without_debug, 0) * len(registry.file_paths),
+        'Every compile logs its full sections; set the djuno logger to INFO or higher.'
+    )]
+
+
+def check_template_loader() -> List[Dict[str, Any]]:
+    from django.template import engines
+    from django.template.backends.django import DjangoTemplates
+
+    results = []
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        loaders = [loader[0] if isinstance(loader, (list, tuple)) else loader
+                   for loader in engine.engine.loaders]
+        if 'django.template.loaders.cached.Loader' in loaders:
+            continue
+        try:
+            cost = timed(lambda: engine.get_template('base.html'), runs=5)
+        except Exception:
+            cost = 0.0
+        results.append(finding(
+            f"Cached template loader is disabled for '{engine.name}'",
+            cost,
+            "Templates are re-read and re-parsed on every render; include "
+            "'django.template.loaders.cached.Loader' in OPTIONS['loaders'].",
+        ))
+    return results
+
+
+def writable(directory: Path) -> bool:
+    try:
+        with tempfile.TemporaryFile(dir=directory):
+            return True
+    except OSError:
+        return False
+
+
+def check_compile_cache(registry) -> List[Dict[str, Any]]:
+    """Whether the compile cache can be written, probed with a temp file.
+
+    A missing directory is fine as long as it can be created: the cache
+    creates it on its first write.
+    """
+    cache_dir = compile_cache.cache_dir
+    if cache_dir.is_dir():
+        if writable(cache_dir):
+            return []
+        problem = f"Compile cache directory {cache_dir} is not writable"
+    else:
+        parent = cache_dir.parent
+        while not parent.exists() and parent != parent.parent:
+            parent = parent.parent
+        if not cache_dir.exists() and parent.is_dir() and writable(parent):
+            return []
+        problem = f"Compile cache directory {cache_dir} cannot be created"
+    cost = sum(timed(lambda p=p: parse_dj_file(p, use_cache=False))
+               for p in registry.file_paths.values())
+    return [finding(
+        problem,
+        cost,
+        "Every process recompiles all components on first use; create the "
+        "directory and make it writable for the server user.",
+    )]
+
+
+def check_css_plugins() -> List[Dict[str, Any]]:
+    loaded = [name for name in CSS_PLUGINS if name in sys.modules]
+    if not loaded:
+        return []
+    cost = 0.0
+    npx = shutil.which('npx')
+    if npx:
+        cost = timed(lambda: subprocess.run(
+            [npx, '--version'], capture_output=True))
+    return [finding(
+        f"CSS plugin loaded at runtime: {', '.join(loaded)}",
+        cost,
+        "process_styles() spawns npx on every call; build CSS ahead of time "
+        "with `djuno css` (cost shown is one npx start).",
+    )]
+
+
+def render_timings(registry) -> List[Dict[str, Any]]:
+    """Cold (compile + first render) and warm render time of every component."""
+    timings = []
+    for name, file_path in sorted(registry.file_paths.items()):
+        stories = story_args(str(Path(file_path).with_suffix('.stories.ts')))
+        props, slots = split_slots(registry[name], stories[0] if stories else {})
+
+        def cold():
+            component = from_sections(
+                name, parse_dj_file(file_path, use_cache=False))
+            return component(slots=slots, **props).render()
+
+        try:
+            cold_ms = timed(cold)
+            warm_ms = timed(lambda: registry[name](
+                slots=slots, **props).render(), runs=20)
+        except Exception as e:
+            timings.append({'name': name, 'error': str(e)})
+            continue
+        timings.append({'name': name, 'cold_ms': cold_ms, 'warm_ms': warm_ms})
+    return timings
+
+
+def audit(registry, djuno_env: str = None) -> Dict[str, Any]:
+    """Run every production performance check. Findings are ranked by cost."""
+    findings = (
+        check_environment(djuno_env)
+        + check_logging(registry)
+        + check_template_loader()
+        + check_compile_cache(registry)
+        + check_css_plugins()
+    )
+    findings.sort(key=lambda f: f['cost_ms'], reverse=True)
+    return {'findings': findings, 'renders': render_timings(registry)}
@@ -0,0 +1,171 @@
+import contextvars
+import secrets
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.cache import get_cache_key, learn_cache_key
+
+from .render_context import current_render
+
+current_capture: contextvars.ContextVar = contextvars.ContextVar(
+    'djuno_donut_capture', default=None)
+
+
+# Headers that describe one particular response rather than the page.
+UNCACHED_HEADERS = ('content-length', 'set-cookie', 'date')
+
+
+class Shell:
+    """A rendered page with the hole components cut out.
+
+    ``offsets`` holds ``(start, end, hole_index)`` for every marker in
+    ``text``, so splicing is a single pass over the precomputed positions.
+    Holes keep only their key and component name: their props come from
+    the request being served, never from the one that filled the cache.
+    ``headers`` are the original response's headers (Vary, Cache-Control,
+    ...), restored on every cached response. ``assets`` are the components,
+    scripts and sprites the page's ``RenderContext`` collected, merged back
+    into the current one on a hit so its asset tags come out complete.
+    """
+
+    def __init__(self, text: str, offsets: List[Tuple[int, int, int]], holes: List[Dict[str, Any]],
+                 content_type: str, headers: List[Tuple[str, str]] = None,
+                 assets: Optional[Dict[str, Any]] = None):
+        self.text = text
+        self.offsets = offsets
+        self.holes = holes
+        self.content_type = content_type
+        self.headers = headers or []
+        self.assets = assets
+
+    def splice(self, request, props: Dict[str, Callable]) -> str:
+        """The page with each hole rendered from ``props[key](request)``.
+
+        A callable may return a ``slots`` entry alongside the props.
+        """
+        from .registry import registry
+
+        render = current_render.get()
+        if render is not None and self.assets:
+            render.merge(self.assets)
+        rendered = []
+        for hole in self.holes:
+            hole_props = dict(props[hole['key']](request))
+            slots = hole_props.pop('slots', None)
+            rendered.append(
+                registry[hole['name']](slots=slots, **hole_props).render())
+
+        parts = []
+        pos = 0
+        for start, end, index in self.offsets:
+            parts.append(self.text[pos:start])
+            parts.append(rendered[index])
+            pos = end
+        parts.append(self.text[pos:])
+        return ''.join(parts)
+
+
+class ShellCapture:
+    """Collects hole components while a page shell renders.
+
+    Every hole needs a per-request props callable in ``props``; a hole
+    without one raises ``ImproperlyConfigured`` instead of being cached
+    with whatever props the first visitor happened to get.
+    """
+
+    def __init__(self, props: Dict[str, Callable] = None):
+        self.token = secrets.token_hex(8)
+        self.props = props or {}
+        self.holes: List[Dict[str, Any]] = []
+
+    def __enter__(self):
+        self.reset = current_capture.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        current_capture.reset(self.reset)
+
+    def marker(self, index: int) -> str:
+        return f'djuno-hole-{self.token}-{index}.'
+
+    def add(self, component) -> str:
+        key = str(component.hole)
+        if key not in self.props:
+            raise ImproperlyConfigured(
+                f"Hole '{key}' ({component.name}) has no per-request props callable; "
+                f"add it to donut_cache(holes={{'{key}': ...}})")
+        self.holes.append({'key': key, 'name': component.name})
+        return self.marker(len(self.holes) - 1)
+
+    def build(self, text: str, content_type: str, headers: List[Tuple[str, str]] = None) -> Shell:
+        offsets = []
+        for index in range(len(self.holes)):
+            marker = self.marker(index)
+            start = text.find(marker)
+            if start != -1:
+                offsets.append((start, start + len(marker), index))
+        offsets.sort()
+        render = current_render.get()
+        assets = render.assets() if render is not None else None
+        return Shell(text, offsets, self.holes, content_type, headers, assets)
+
+
+def cacheable(response) -> bool:
+    """Whether a rendered response may be stored as a shared shell."""
+    cache_control = response.get('Cache-Control', '').lower()
+    return (response.status_code == 200 and not response.cookies
+            and 'private' not in cache_control and 'no-store' not in cache_control)
+
+
+def donut_cache(
+    timeout: Optional[int] = 300,
+    holes: Dict[str, Callable] = None,
+    key_prefix: str = 'djuno.donut',
+    cache_alias: str = 'default'
+):
+    """Cache a view's page shell and render only its hole components per request.
+
+    Components created with ``hole="<key>"`` are cut out of the cached page
+    and re-rendered on every request. ``holes`` maps every hole key to a
+    callable taking the request and returning that hole's props (and
+    optionally its ``slots``); a hole without one is a configuration error.
+    Only successful GET/HEAD responses are cached, and not ones that set
+    cookies or are marked private or no-store. Shells are keyed like
+    Django's cache middleware: by method, host and full URL, plus the
+    request headers the response's ``Vary`` names. Cached responses carry
+    the original response's headers.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            props = holes or {}
+            cache = caches[cache_alias]
+            key = get_cache_key(request, key_prefix, request.method, cache)
+            shell = cache.get(key) if key is not None else None
+            if shell is None:
+                with ShellCapture(props) as capture:
+                    response = view(request, *args, **kwargs)
+                    if hasattr(response, 'render') and callable(response.render):
+                        response.render()
+                if response.streaming:
+                    return response
+                headers = [(name, value) for name, value in response.items()
+                           if name.lower() not in UNCACHED_HEADERS]
+                shell = capture.build(
+                    response.content.decode(response.charset), response['Content-Type'], headers)
+                if cacheable(response):
+                    cache.set(learn_cache_key(request, response, timeout, key_prefix, cache), shell, timeout)
+                response.content = shell.splice(request, props)
+                return response
+            response = HttpResponse(shell.splice(request, props), content_type=shell.content_type)
+            for name, value in shell.headers:
+                response[name] = value
+            return response
+        return wrapper
+    return decorator
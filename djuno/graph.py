@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from .compiler import extract_template, file_hash
+
+DEFAULT_GRAPH_PATH = 'djuno/cache/graph.json'
+
+logger = logging.getLogger(__name__)
+
+# <button_component ...> and {% icon_component ... %}
+REFERENCE_RE = re.compile(r'(?:<|{%-?\s*)([A-Za-z_][A-Za-z0-9_]*?)_component\b')
+
+
+def settings_template_dirs() -> List[str]:
+    """Template ``DIRS`` of the Django project, or none outside one."""
+    from django.conf import settings
+
+    if not settings.configured:
+        return []
+    return [str(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+
+
+def template_origins(name: str) -> Dict[str, str]:
+    """Every template rendering ``name`` loads, mapped to the file it came from.
+
+    Follows ``{% extends %}`` and ``{% include %}`` tags whose template
+    name is a string literal; names held in variables can't be known
+    before the render and aren't followed.
+    """
+    from django.template.loader import get_template
+    from django.template.loader_tags import ExtendsNode, IncludeNode
+
+    origins: Dict[str, str] = {}
+    stack = [name]
+    while stack:
+        current = stack.pop()
+        if current in origins:
+            continue
+        compiled = get_template(current).template
+        origins[current] = compiled.origin.name
+        expressions = [node.parent_name for node in compiled.nodelist.get_nodes_by_type(ExtendsNode)]
+        expressions += [node.template for node in compiled.nodelist.get_nodes_by_type(IncludeNode)]
+        stack.extend(expression.var for expression in expressions
+                     if isinstance(expression.var, str) and not expression.filters)
+    return origins
+
+
+def extract_references(text: str) -> Set[str]:
+    """Names of the components a template refers to."""
+    return set(REFERENCE_RE.findall(text))
+
+
+class DependencyGraph:
+    """Which components each component and page template uses.
+
+    Nodes are component names (``button``) and template names relative to
+    their template directory (``index.html``), as Django loads them. Each node records the content hash it was
+    scanned at, so ``update`` only rescans files that changed.
+    """
+
+    def __init__(self, path: str = DEFAULT_GRAPH_PATH):
+        self.path = Path(path)
+        self.nodes: Dict[str, Dict] = {}
+        try:
+            self.nodes = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def update(self, component_paths: Dict[str, str], template_dirs: Iterable[str] = ()) -> List[str]:
+        """Rescan changed files and drop removed ones. Returns the changed nodes.
+
+        Nodes outside ``component_paths`` and ``template_dirs`` are kept
+        until their file disappears, so a partial update (one component's
+        reload, say) never loses the template edges scanned elsewhere.
+        """
+        files = dict(component_paths)
+        for template_dir in template_dirs:
+            for template_path in Path(template_dir).rglob('*.html'):
+                name = template_path.relative_to(template_dir).as_posix()
+                files.setdefault(name, str(template_path))
+
+        changed = []
+        for node, file_path in files.items():
+            digest = file_hash(file_path)
+            entry = self.nodes.get(node)
+            if entry and entry['hash'] == digest:
+                continue
+            text = Path(file_path).read_text()
+            if node in component_paths:
+                text = extract_template(text)
+            uses = extract_references(text)
+            uses.discard(node)
+            self.nodes[node] = {
+                'file': file_path,
+                'hash': digest,
+                'component': node in component_paths,
+                'uses': sorted(uses),
+            }
+            changed.append(node)
+        for node in set(self.nodes) - set(files):
+            if not Path(self.nodes[node]['file']).exists():
+                del self.nodes[node]
+                changed.append(node)
+        return changed
+
+    def save(self):
+        """Write the graph through a temp file, so readers never see a partial file.
+
+        An unwritable cache dir is logged and skipped; the nodes stay in memory.
+        """
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.nodes, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Dependency graph {self.path} is not writable, keeping it in memory: {e}")
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def dependencies(self, node: str) -> Set[str]:
+        """Components ``node`` uses, directly or transitively."""
+        seen: Set[str] = set()
+        stack = list(self.nodes.get(node, {}).get('uses', []))
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.nodes.get(name, {}).get('uses', []))
+        return seen
+
+    def dependents(self, name: str) -> Set[str]:
+        """Components and templates that use ``name``, directly or transitively."""
+        used_by: Dict[str, Set[str]] = {}
+        for node, entry in self.nodes.items():
+            for used in entry['uses']:
+                used_by.setdefault(used, set()).add(node)
+        seen: Set[str] = set()
+        stack = list(used_by.get(name, ()))
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(used_by.get(node, ()))
+        return seen
+
+    def invalidated_by(self, name: str) -> Set[str]:
+        """Everything that must be rebuilt when ``name`` changes, itself included."""
+        return {name} | self.dependents(name)
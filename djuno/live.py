@@ -0,0 +1,37 @@
+import json
+import os
+import queue
+from typing import Iterator
+
+from django.utils.safestring import mark_safe
+
+ENABLED = os.getenv('DJUNO_ENV') == 'development'
+KEEPALIVE_SECONDS = 15
+
+
+def wrap(component, html: str) -> str:
+    """Bracket a render in comments the live-reload client finds and swaps.
+
+    The opening comment carries the instance's signed lazy-load token, so
+    the client can re-render it through the component endpoint.
+    """
+    return mark_safe(
+        f'<!--djuno:{component.name} {component.get_lazy_token()}-->'
+        f'{html}<!--/djuno:{component.name}-->'
+    )
+
+
+def events(registry, keepalive: float = KEEPALIVE_SECONDS) -> Iterator[str]:
+    """Server-sent events naming the components the registry reloaded."""
+    listener = registry.subscribe()
+    try:
+        yield 'retry: 1000\n\n'
+        while True:
+            try:
+                names = listener.get(timeout=keepalive)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            yield f'event: component\ndata: {json.dumps(names)}\n\n'
+    finally:
+        registry.unsubscribe(listener)
@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_MANIFEST_PATH = 'static/vite/.vite/manifest.json'
+
+
+class ViteManifest:
+    """Vite's ``manifest.json``, loaded once and reloaded when its mtime changes."""
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.mtime: Optional[int] = None
+        self.chunks: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return self.chunks
+        if mtime != self.mtime:
+            with self.lock:
+                if mtime != self.mtime:
+                    with open(self.path) as f:
+                        self.chunks = json.load(f)
+                    self.mtime = mtime
+        return self.chunks
+
+    def entry_key(self, file_path: str) -> Optional[str]:
+        """Manifest key for a component's .dj source."""
+        chunks = self.load()
+        key = file_path.replace(os.sep, '/')
+        if key in chunks:
+            return key
+        suffix = '/' + key.rsplit('/', 1)[-1]
+        for candidate, chunk in chunks.items():
+            if chunk.get('isEntry') and candidate.endswith(suffix):
+                return candidate
+        return None
+
+    def import_chain(self, key: str) -> List[str]:
+        """Keys of every chunk ``key`` statically imports, depth first, without duplicates."""
+        chunks = self.load()
+        seen: List[str] = []
+        stack = list(reversed(chunks.get(key, {}).get('imports', [])))
+        while stack:
+            imported = stack.pop()
+            if imported in seen:
+                continue
+            seen.append(imported)
+            stack.extend(reversed(chunks.get(imported, {}).get('imports', [])))
+        return seen
+
+    def assets(self, keys: List[str]) -> Dict[str, List[str]]:
+        """Files to emit for entry ``keys``: entry scripts, preloads and CSS."""
+        chunks = self.load()
+        result = {'scripts': [], 'preloads': [], 'css': []}
+        for key in keys:
+            chunk = chunks.get(key)
+            if chunk is None:
+                continue
+            if chunk['file'] not in result['scripts']:
+                result['scripts'].append(chunk['file'])
+            chain = self.import_chain(key)
+            for imported in chain:
+                file = chunks.get(imported, {}).get('file')
+                if file and file not in result['preloads']:
+                    result['preloads'].append(file)
+            for imported in [key] + chain:
+                for css in chunks.get(imported, {}).get('css', []):
+                    if css not in result['css']:
+                        result['css'].append(css)
+        return result
+
+
+manifests: Dict[str, ViteManifest] = {}
+
+
+def get_manifest(path: str = None) -> ViteManifest:
+    """Process-wide manifest for ``path`` (default: DJUNO_VITE_MANIFEST)."""
+    if path is None:
+        from django.conf import settings
+        path = getattr(settings, 'DJUNO_VITE_MANIFEST', DEFAULT_MANIFEST_PATH)
+    if path not in manifests:
+        manifests[path] = ViteManifest(path)
+    return manifests[path]
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+
+from .assets import component_links, current_usage
+from .render_context import MARKER, RenderContext
+
+
+class EarlyHintsMiddleware:
+    """Send ``Link: rel=preload`` headers for the assets a route last needed.
+
+    Records which components each view rendered and remembers their assets
+    in a bounded LRU map keyed by URL pattern (DJUNO_EARLY_HINTS_MAX_ROUTES,
+    default 500). The next response for that route carries the remembered
+    ``Link`` header; CDNs and servers that support Early Hints turn it into
+    a ``103`` response, and for streaming responses it goes out before the
+    body renders.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_routes = getattr(
+            settings, 'DJUNO_EARLY_HINTS_MAX_ROUTES', 500)
+        self.routes: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def route_key(self, request) -> Optional[str]:
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return None
+        return f'{request.method}:{match.view_name or match.route}'
+
+    def remembered(self, key: str) -> Tuple[FrozenSet[str], List[str]]:
+        with self.lock:
+            entry = self.routes.get(key)
+            if entry is None:
+                return frozenset(), []
+            self.routes.move_to_end(key)
+            return entry
+
+    def remember(self, key: str, usage: FrozenSet[str], links: List[str]):
+        with self.lock:
+            self.routes[key] = (usage, links)
+            self.routes.move_to_end(key)
+            while len(self.routes) > self.max_routes:
+                self.routes.popitem(last=False)
+
+    def __call__(self, request):
+        usage = set()
+        token = current_usage.set(usage)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_usage.reset(token)
+
+        key = self.route_key(request)
+        if key is None:
+            return response
+        last_usage, links = self.remembered(key)
+        if links and 'Link' not in response:
+            response['Link'] = ', '.join(links)
+        # Streaming bodies render after this returns, so their usage is incomplete.
+        if response.status_code == 200 and not response.streaming and usage != last_usage:
+            self.remember(key, frozenset(usage), component_links(usage))
+        return response
+
+
+class RenderContextMiddleware:
+    """Give each request its own ``RenderContext`` and fill in the asset tags.
+
+    Identical component renders are memoized for the request, and the
+    ``{% djuno_assets %}`` markers in an HTML response are replaced with
+    the CSS, scripts and sprites of the components it rendered. Streaming
+    responses render after this returns and are passed through untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.marker = MARKER.split('{')[0].encode()
+
+    def __call__(self, request):
+        with RenderContext() as render:
+            response = self.get_response(request)
+            if callable(getattr(response, 'render', None)) and not response.is_rendered:
+                response.render()
+        if (not response.streaming and 'html' in response.get('Content-Type', '')
+                and self.marker in response.content):
+            response.content = render.finalize(response.content.decode(response.charset))
+            if response.has_header('Content-Length'):
+                response['Content-Length'] = str(len(response.content))
+        return response
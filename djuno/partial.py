@@ -0,0 +1,212 @@
+import itertools
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from django import template
+from django.template.base import TextNode, Variable, VariableNode
+from django.template.defaulttags import CommentNode, IfNode, LoadNode, TemplateLiteral
+from django.utils.safestring import mark_safe
+
+DEFAULT_MAX_VARIANTS = 256
+TRUTHY_OPERATORS = ('and', 'or', 'not')
+IMPURE_FILTERS = ('random',)
+
+Part = Union[str, template.Node]
+
+
+def expression_roots(expression) -> Set[str]:
+    """Context names a filter expression reads."""
+    roots = set()
+    for var in [expression.var] + [arg for _, args in expression.filters for _, arg in args]:
+        if isinstance(var, Variable) and var.lookups:
+            roots.add(var.lookups[0])
+    return roots
+
+
+def is_pure(expression) -> bool:
+    return all(
+        func.__module__ == 'django.template.defaultfilters' and func.__name__ not in IMPURE_FILTERS
+        for func, _ in expression.filters
+    )
+
+
+def condition_roots(condition, truthy: bool = True) -> Tuple[Set[str], Set[str]]:
+    """Names an ``{% if %}`` condition reads, split into (truth-tested only, other).
+
+    A name is truth-tested when it appears bare, without filters or
+    lookups, only under ``and``/``or``/``not``, so its truthiness alone
+    decides the outcome.
+    """
+    if isinstance(condition, TemplateLiteral):
+        expression = condition.value
+        var = expression.var
+        if truthy and not expression.filters and isinstance(var, Variable) and var.lookups and len(var.lookups) == 1:
+            return {var.lookups[0]}, set()
+        return set(), expression_roots(expression)
+    truthy = truthy and condition.id in TRUTHY_OPERATORS
+    tested, other = set(), set()
+    for operand in (condition.first, condition.second):
+        if operand is not None:
+            operand_tested, operand_other = condition_roots(operand, truthy)
+            tested |= operand_tested
+            other |= operand_other
+    return tested, other
+
+
+class PartialTemplate:
+    """A component template partially evaluated against its finite props.
+
+    ``dims`` are the enumerable props (choices or bool) the template reads
+    and ``bits`` the free-form props it only truth-tests in ``{% if %}``.
+    For every combination of their values, static text, ``{{ }}`` output
+    and ``{% if %}`` branches that depend on nothing else are folded into
+    constant strings; the remaining nodes are kept and rendered per call.
+    Rendering is then a dict lookup plus those few nodes.
+    """
+
+    def __init__(self, source: str, dims: Dict[str, list], bits: List[str], known: Dict[str, Any]):
+        self.template = template.Template(source)
+        self.dims = dims
+        self.bits = bits
+        self.names = set(dims) | set(bits) | set(known)
+        self.variants: Dict[tuple, List[Part]] = {}
+        names = list(dims)
+        for values in itertools.product(*dims.values(), *[(False, True)] * len(bits)):
+            env = dict(known)
+            env.update(zip(names + bits, values))
+            for name, value in known.items():
+                if callable(value):
+                    env[name] = value(env)
+            self.variants[values] = fold(
+                self.template.nodelist, env, set(env) - set(bits), set(bits))
+
+    @property
+    def holes(self) -> int:
+        """Nodes left to render per call, in the largest variant."""
+        return max((sum(1 for part in parts if not isinstance(part, str))
+                    for parts in self.variants.values()), default=0)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every variant is constant text plus plain ``{{ }}`` interpolations."""
+        return all(isinstance(part, (str, VariableNode))
+                   for parts in self.variants.values() for part in parts)
+
+    def key(self, data: Dict[str, Any]) -> tuple:
+        return tuple(data.get(name) for name in self.dims) + tuple(bool(data.get(name)) for name in self.bits)
+
+    def render(self, data: Dict[str, Any], overrides: Set[str] = frozenset()) -> str:
+        """Render ``data``; ``overrides`` are context names not set the usual way (e.g. slots)."""
+        context = template.Context(data)
+        parts = None
+        if not overrides & self.names:
+            try:
+                parts = self.variants.get(self.key(data))
+            except TypeError:
+                pass
+        if parts is None:
+            return self.template.render(context)
+        with context.render_context.push_state(self.template):
+            with context.bind_template(self.template):
+                return mark_safe(''.join(
+                    part if isinstance(part, str) else part.render_annotated(context)
+                    for part in parts))
+
+
+def fold(nodelist, env: Dict[str, Any], known: Set[str], bits: Set[str]) -> List[Part]:
+    """Evaluate what ``env`` decides in ``nodelist``; keep the rest as nodes."""
+    parts: List[Part] = []
+
+    def add(part: Part):
+        if isinstance(part, str) and parts and isinstance(parts[-1], str):
+            parts[-1] += part
+        else:
+            parts.append(part)
+
+    for node in nodelist:
+        if isinstance(node, TextNode):
+            add(node.s)
+        elif isinstance(node, (CommentNode, LoadNode)):
+            continue
+        elif isinstance(node, VariableNode) and expression_roots(node.filter_expression) <= known \
+                and is_pure(node.filter_expression):
+            add(node.render(template.Context(env)))
+        elif isinstance(node, IfNode) and decidable(node, known, bits):
+            context = template.Context(env)
+            for condition, branch in node.conditions_nodelists:
+                if condition is None or condition.eval(context):
+                    for part in fold(branch, env, known, bits):
+                        add(part)
+                    break
+        else:
+            add(node)
+    return parts
+
+
+def decidable(node: IfNode, known: Set[str], bits: Set[str]) -> bool:
+    for condition, _ in node.conditions_nodelists:
+        if condition is None:
+            continue
+        tested, other = condition_roots(condition)
+        if not other <= known or not tested <= known | bits:
+            return False
+    return True
+
+
+def analyse(nodelist, names: Set[str], free: Set[str]) -> Tuple[Set[str], Set[str]]:
+    """Which of ``names`` the template reads, and which ``free`` names it only truth-tests."""
+    used, tested = set(), set()
+    for node in nodelist:
+        if isinstance(node, VariableNode):
+            used |= expression_roots(node.filter_expression) & names
+        elif isinstance(node, IfNode):
+            for condition, branch in node.conditions_nodelists:
+                if condition is not None:
+                    condition_tested, other = condition_roots(condition)
+                    used |= (condition_tested | other) & names
+                    if not other - names and not condition_tested - names - free:
+                        tested |= condition_tested & free
+                branch_used, branch_tested = analyse(branch, names, free)
+                used |= branch_used
+                tested |= branch_tested
+    return used, tested
+
+
+def build_partial(component, max_variants: Optional[int] = None) -> PartialTemplate:
+    """Partially evaluate ``component``'s template over its finite prop space.
+
+    Falls back to folding only static text when the component customises
+    its context or has more than ``max_variants`` combinations.
+    """
+    from .component import Component
+
+    if max_variants is None:
+        from django.conf import settings
+        max_variants = getattr(settings, 'DJUNO_MAX_VARIANTS', DEFAULT_MAX_VARIANTS)
+    if component.get_context_data is not Component.get_context_data:
+        return PartialTemplate(component.template, {}, [], {})
+
+    domains = {name: prop.domain() for name, prop in component.props.items()
+               if prop.domain() is not None}
+    known: Dict[str, Any] = {'styles': component.styles}
+    for name, prop in component.computed_props.items():
+        if set(prop.deps) <= set(domains):
+            known[name] = lambda env, prop=prop: prop.cached(*(env[d] for d in prop.deps))
+    free = set(component.props) - set(domains)
+
+    nodelist = template.Template(component.template).nodelist
+    used, tested = analyse(nodelist, set(domains) | set(known), free)
+    for name in used & set(component.computed_props):
+        used |= set(component.computed_props[name].deps)
+    dims = {name: domains[name] for name in sorted(used & set(domains))}
+    bits = sorted(tested)
+    known = {name: value for name, value in known.items()
+             if name not in component.computed_props
+             or set(component.computed_props[name].deps) <= set(dims)}
+
+    count = 2 ** len(bits)
+    for values in dims.values():
+        count *= len(values)
+    if count > max_variants:
+        dims, bits = {}, []
+        known = {'styles': component.styles}
+    return PartialTemplate(component.template, dims, bits, known)
@@ -0,0 +1,167 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .compiler import file_hash
+from .graph import DependencyGraph, settings_template_dirs, template_origins
+
+SYMBOL_RE = re.compile(r'<symbol\b[^>]*\bid="([^"]+)"')
+
+
+def sprite_ids(svg_path: str) -> List[str]:
+    """Symbol ids defined in an SVG sprite such as ``static/icons.svg``."""
+    return SYMBOL_RE.findall(Path(svg_path).read_text())
+
+
+def parse_prop_values(spec: str) -> List[str]:
+    """``a,b,c`` lists values; ``@path/to/sprite.svg`` enumerates its symbols."""
+    if spec.startswith('@'):
+        return sprite_ids(spec[1:])
+    return [value for value in spec.split(',') if value]
+
+
+def component_targets(name: str, prop_values: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """One target per combination of the enumerated prop values."""
+    keys = sorted(prop_values)
+    targets = []
+    for values in itertools.product(*(prop_values[key] for key in keys)):
+        props = dict(zip(keys, values))
+        key = name + ''.join(f';{k}={v}' for k, v in props.items())
+        targets.append({'kind': 'component', 'key': key,
+                       'name': name, 'props': props})
+    return targets
+
+
+def url_targets(urls: List[str]) -> List[Dict[str, Any]]:
+    return [{'kind': 'url', 'key': url, 'url': url} for url in urls]
+
+
+def template_targets(templates: List[str]) -> List[Dict[str, Any]]:
+    return [{'kind': 'template', 'key': name, 'template': name} for name in templates]
+
+
+def slugify_key(key: str) -> str:
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', key).strip('-')
+    return slug or 'index'
+
+
+def fingerprint(target: Dict[str, Any], file_paths: Dict[str, str], graph: Optional[DependencyGraph] = None) -> str:
+    """Hash of the sources a target's output depends on.
+
+    Templates depend on every template they extend or include and on the
+    components those use transitively, per the dependency graph (or on
+    every component when the graph doesn't know them). URLs depend on
+    every component and every template in the project's template
+    ``DIRS``; app templates, views and data aren't tracked, so re-run
+    with ``--force`` after changing those.
+    """
+    if target['kind'] == 'component':
+        names = {target['name']} | (graph.dependencies(target['name']) if graph else set())
+        templates = []
+    elif target['kind'] == 'template':
+        origins = template_origins(target['template'])
+        if graph and all(name in graph.nodes for name in origins):
+            names = set().union(*(graph.dependencies(name) for name in origins))
+        else:
+            names = set(file_paths)
+        templates = sorted(origins.values())
+    else:
+        names = set(file_paths)
+        templates = sorted(str(path) for template_dir in settings_template_dirs()
+                           for path in Path(template_dir).rglob('*.html'))
+    sources = [file_hash(file_paths[name])
+               for name in sorted(names) if name in file_paths]
+    sources += [file_hash(path) for path in templates]
+    sources.append(json.dumps(target, sort_keys=True))
+    return hashlib.sha1(':'.join(sources).encode()).hexdigest()
+
+
+def render_target(target: Dict[str, Any]) -> str:
+    if target['kind'] == 'component':
+        from .registry import registry
+        return registry[target['name']](**target['props']).render()
+    if target['kind'] == 'template':
+        from django.template.loader import render_to_string
+        return render_to_string(target['template'])
+
+    from django.test import Client
+    response = Client().get(target['url'])
+    if response.status_code != 200:
+        raise ValueError(
+            f"{target['url']} returned status {response.status_code}")
+    return response.content.decode(response.charset or 'utf-8')
+
+
+def init_worker(settings_module: Optional[str]):
+    import django
+
+    if settings_module:
+        os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    django.setup()
+
+
+def prerender(
+    targets: List[Dict[str, Any]],
+    output_dir: str,
+    file_paths: Dict[str, str],
+    jobs: Optional[int] = None,
+    force: bool = False,
+    settings_module: Optional[str] = None,
+    graph: Optional[DependencyGraph] = None
+) -> Dict[str, List[str]]:
+    """Render targets to content-hashed HTML files plus a manifest.
+
+    Targets whose source fingerprint matches the previous manifest are
+    skipped unless ``force`` is set. Writes ``manifest.json`` (key to file
+    and fingerprint) and ``nginx.map`` (URL to file) into ``output_dir``.
+    Returns the keys that were rendered, skipped and failed.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / 'manifest.json'
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+
+    result = {'rendered': [], 'skipped': [], 'failed': []}
+    pending = []
+    for target in targets:
+        fp = fingerprint(target, file_paths, graph)
+        entry = manifest.get(target['key'])
+        if not force and entry and entry['fingerprint'] == fp and (output / entry['file']).exists():
+            result['skipped'].append(target['key'])
+        else:
+            pending.append((target, fp))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(settings_module,)) as pool:
+        futures = [(target, fp, pool.submit(render_target, target))
+                   for target, fp in pending]
+        for target, fp, future in futures:
+            try:
+                html = future.result()
+            except Exception as e:
+                message = str(e).splitlines()[0] if str(e) else repr(e)
+                result['failed'].append(f"{target['key']}: {message}")
+                continue
+            digest = hashlib.sha1(html.encode('utf-8')).hexdigest()[:12]
+            file_name = f"{slugify_key(target['key'])}.{digest}.html"
+            (output / file_name).write_text(html)
+            old = manifest.get(target['key'])
+            if old and old['file'] != file_name:
+                (output / old['file']).unlink(missing_ok=True)
+            manifest[target['key']] = {
+                'kind': target['kind'], 'file': file_name, 'fingerprint': fp}
+            result['rendered'].append(target['key'])
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    with open(output / 'nginx.map', 'w') as f:
+        for key, entry in sorted(manifest.items()):
+            if entry['kind'] == 'url':
+                f.write(f"{key} {entry['file']};\n")
+    return result
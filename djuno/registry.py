@@ -1,32 +1,174 @@
-from typing import Dict, Type
-from .component import Component, from_dj_file
+from typing import Dict, Iterable, List, Optional, Set, Type
+from . import live
+from .component import Component, from_dj_file, from_sections
+from .compiler import logger
+from .graph import DependencyGraph, settings_template_dirs
+from .store import ComponentStore
+from .tracing import traced
 from glob import glob
 from pathlib import Path
 import watchfiles
-import os
+import gc
+import queue
+import threading
 
 
 class ComponentRegistry:
     def __init__(self, base_dir: str):
         self.components: Dict[str, Type[Component]] = {}
+        self.compile_locks: Dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
         self.base_dir = base_dir
         self.file_paths: Dict[str, str] = {}
+        self.graph = DependencyGraph()
+        self.listeners: List[queue.Queue] = []
+        self.watcher: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.store: Optional[ComponentStore] = None
         self.load_component_paths()
 
-        if os.getenv('DJUNO_ENV') == 'development':
-            for changes in watchfiles.watch(base_dir):
-                self.load_component_paths()
+        if live.ENABLED:
+            self.start_watching()
 
     def load_component_paths(self):
-        self.file_paths.clear()
-        for dj_file in glob(f'{self.base_dir}/*/*.dj'):
-            name = Path(dj_file).stem
-            self.file_paths[name] = dj_file
+        # Swap in a new dict so concurrent lookups never see it half-filled.
+        self.file_paths = {Path(dj_file).stem: dj_file
+                           for dj_file in glob(f'{self.base_dir}/*/*.dj')}
 
+    def start_watching(self):
+        """Watch ``base_dir`` in a daemon thread and reload components as they change."""
+        if self.watcher is None:
+            self.stop_event.clear()
+            self.watcher = threading.Thread(
+                target=self.watch, name='djuno-watcher', daemon=True)
+            self.watcher.start()
+
+    def stop_watching(self):
+        self.stop_event.set()
+        if self.watcher is not None:
+            self.watcher.join()
+            self.watcher = None
+
+    def watch(self):
+        for changes in watchfiles.watch(self.base_dir, stop_event=self.stop_event):
+            self.reload(path for _, path in changes)
+
+    def reload(self, paths: Iterable[str]) -> List[str]:
+        """Invalidate the components affected by changed ``paths`` and announce them."""
+        self.load_component_paths()
+        affected: Set[str] = set()
+        for path in paths:
+            if path.endswith('.dj'):
+                affected |= self.invalidate(Path(path).stem)
+        changed = sorted(affected & set(self.file_paths))
+        if changed:
+            self.publish(changed)
+        return changed
+
+    def subscribe(self) -> queue.Queue:
+        """Queue that receives the list of component names after each reload."""
+        listener: queue.Queue = queue.Queue()
+        with self.lock:
+            self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: queue.Queue):
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def publish(self, names: List[str]):
+        with self.lock:
+            for listener in self.listeners:
+                listener.put(names)
+
+    def ensure_graph(self) -> DependencyGraph:
+        """The dependency graph, scanned and saved first if graph.json was missing."""
+        if not self.graph.nodes:
+            with self.lock:
+                if not self.graph.nodes:
+                    self.graph.update(self.file_paths, settings_template_dirs())
+                    self.graph.save()
+        return self.graph
+
+    def invalidate(self, name: str) -> Set[str]:
+        """Drop ``name`` and every component that uses it, so they recompile.
+
+        Returns the component and template names affected by the change.
+        """
+        self.graph.update(self.file_paths, settings_template_dirs())
+        self.graph.save()
+        affected = self.graph.invalidated_by(name)
+        for node in affected:
+            self.components.pop(node, None)
+        return affected
+
+    @traced(
+        'djuno.lookup',
+        lambda self, key: {'djuno.component': key,
+                           'djuno.cache_hit': key in self.components}
+    )
     def __getitem__(self, key: str) -> Type[Component]:
-        if key not in self.components:
-            self.components[key] = from_dj_file(self.file_paths[key])
-        return self.components[key]
+        component = self.components.get(key)
+        if component is None:
+            component = self.compile(key)
+        return component
+
+    def compile(self, key: str) -> Type[Component]:
+        """Compile ``key`` once, however many threads ask for it at the same time.
+
+        The first caller compiles while later callers wait on the same
+        per-component lock and then read its result. Warm lookups never
+        reach this and take no lock.
+        """
+        file_path = self.file_paths[key]
+        with self.lock:
+            lock = self.compile_locks.setdefault(key, threading.Lock())
+        with lock:
+            component = self.components.get(key)
+            if component is None:
+                component = from_dj_file(file_path)
+                self.components[key] = component
+        return component
+
+    def preload(self, store_path: Optional[str] = None):
+        """Compile every component up front, before the server forks.
+
+        Call this from the master process (e.g. gunicorn's ``preload_app``
+        or ``on_starting`` hook). With ``store_path``, sections are read from
+        a memory-mapped store built by ``djuno build-store`` instead of
+        parsing each .dj file; the mapping stays open as ``self.store``.
+        Components whose .dj file no longer matches the hash recorded in
+        the store, or that aren't in it, are compiled from the file instead.
+        The dependency graph is built if it's missing. Each component's
+        prop variants are precomputed (see ``djuno.partial``), and the
+        loaded objects are moved to the permanent GC generation so
+        collections in the workers don't touch them and the pages stay
+        shared copy-on-write.
+        """
+        if store_path:
+            if self.store is not None:
+                self.store.close()
+            self.store = store = ComponentStore(store_path)
+            for name in store:
+                file_path = self.file_paths.get(name)
+                if file_path and store.is_stale(name, file_path):
+                    logger.warning(f"{store_path} is stale for '{name}', compiling {file_path}")
+                    continue
+                self.components[name] = from_sections(
+                    name, store.sections(name), store.version(name))
+        for name in self.file_paths:
+            self[name]
+        for component in self.components.values():
+            component.partial()
+        self.ensure_graph()
+        gc.collect()
+        gc.freeze()
+
+
+def register_component(name: str, component: Type[Component]):
+    """Make ``component`` available as ``registry[name]``."""
+    registry.components[name] = component
 
 
 registry = ComponentRegistry('components')
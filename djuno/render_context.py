@@ -0,0 +1,173 @@
+import contextvars
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from django.conf import settings
+
+current_render: contextvars.ContextVar = contextvars.ContextVar(
+    'djuno_render', default=None)
+
+ASSET_KINDS = ('css', 'scripts', 'sprites', 'vite')
+MARKER = '<!--djuno-assets:{}-->'
+SPRITE_REF_RE = re.compile(r'href="([^"#]+\.svg)#([\w-]+)"')
+SYMBOL_BLOCK_RE = re.compile(r'<symbol\b[^>]*\bid="([^"]+)".*?</symbol>', re.DOTALL)
+DEFAULT_MAX_RENDERS = 1000
+
+
+def sprite_file(url: str) -> Optional[Path]:
+    """Local file behind a static sprite URL, if it can be found."""
+    from django.contrib.staticfiles import finders
+
+    static_url = '/' + settings.STATIC_URL.lstrip('/')
+    if not url.startswith(static_url):
+        return None
+    found = finders.find(url[len(static_url):])
+    return Path(found) if found else None
+
+
+class RenderContext:
+    """Render state for one request (or one ``with`` block).
+
+    Components rendered inside it are recorded, along with the assets they
+    need: their CSS, hydration scripts and the SVG sprite symbols their
+    output references. Identical renders (same class, props and slots)
+    are memoized, up to DJUNO_RENDER_MEMO_MAX distinct ones (default
+    1000). Page tags emit markers that ``finalize`` replaces once the whole
+    page has rendered, so a tag in ``<head>`` still sees every component.
+
+        with RenderContext() as render:
+            html = render.finalize(template.render(context))
+    """
+
+    def __init__(self, max_renders: Optional[int] = None):
+        self.max_renders = max_renders if max_renders is not None else getattr(
+            settings, 'DJUNO_RENDER_MEMO_MAX', DEFAULT_MAX_RENDERS)
+        self.renders: Dict[tuple, str] = {}
+        self.hits = 0
+        self.components: Dict[str, type] = {}
+        self.scripts: List[str] = []
+        self.sprites: Dict[str, Set[str]] = {}
+        self.pages: Set[str] = set()
+        self.token = None
+
+    def __enter__(self) -> 'RenderContext':
+        self.token = current_render.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        current_render.reset(self.token)
+        self.token = None
+
+    def key(self, component) -> Optional[tuple]:
+        try:
+            key = (type(component), tuple(sorted(component.kwargs.items())),
+                   tuple(sorted(component.slots.items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Optional[tuple]) -> Optional[str]:
+        html = self.renders.get(key) if key is not None else None
+        if html is not None:
+            self.hits += 1
+        return html
+
+    def use(self, component):
+        """Record that ``component`` is on the page, so its CSS is included.
+
+        Called before anything else in a render, including the hole, lazy
+        and deadline placeholders that never reach ``add``.
+        """
+        self.components.setdefault(component.name, type(component))
+
+    def add(self, component, key: Optional[tuple], html: str):
+        """Record a fresh render and the assets it uses."""
+        self.use(component)
+        hydration = component.get_hydration_data()
+        if hydration and hydration not in self.scripts:
+            self.scripts.append(hydration)
+        for url, symbol in SPRITE_REF_RE.findall(html):
+            self.sprites.setdefault(url, set()).add(symbol)
+        if key is not None and len(self.renders) < self.max_renders:
+            self.renders[key] = html
+
+    def assets(self) -> Dict[str, Any]:
+        """The collected assets in a picklable form, for ``merge`` to restore."""
+        return {
+            'components': sorted(self.components),
+            'scripts': list(self.scripts),
+            'sprites': {url: sorted(ids) for url, ids in self.sprites.items()},
+        }
+
+    def merge(self, assets: Dict[str, Any]):
+        """Add assets saved by ``assets``, e.g. those of a cached page shell."""
+        from .registry import registry
+
+        for name in assets['components']:
+            if name not in self.components:
+                self.components[name] = registry[name]
+        for script in assets['scripts']:
+            if script not in self.scripts:
+                self.scripts.append(script)
+        for url, ids in assets['sprites'].items():
+            self.sprites.setdefault(url, set()).update(ids)
+
+    def render_css(self) -> str:
+        """The used components' styles, scoped with ``djuno.css.scope_css``."""
+        from .css import expand_apply, load_table, scope_css
+
+        table = load_table()
+        blocks = []
+        for name, component in sorted(self.components.items()):
+            css = component.css.strip()
+            if not css:
+                continue
+            css = scope_css(css, component.styles)
+            try:
+                css = expand_apply(css, table)
+            except ValueError:
+                pass
+            blocks.append(css)
+        return f'<style>{"".join(blocks)}</style>' if blocks else ''
+
+    def render_scripts(self) -> str:
+        return ''.join(self.scripts)
+
+    def render_vite(self) -> str:
+        """Vite tags for the page's graph dependencies and every rendered component."""
+        from .templatetags.djuno import vite_tags
+
+        return vite_tags(self.pages | set(self.components))
+
+    def inline_sprites(self, html: str) -> str:
+        """Inline the used symbols of each sprite and point references at them."""
+        symbols = []
+        inlined: Dict[str, Set[str]] = {}
+        for url, ids in sorted(self.sprites.items()):
+            path = sprite_file(url)
+            if path is None:
+                continue
+            for match in SYMBOL_BLOCK_RE.finditer(path.read_text()):
+                if match.group(1) in ids:
+                    symbols.append(match.group(0))
+                    inlined.setdefault(url, set()).add(match.group(1))
+        if not symbols:
+            return html.replace(MARKER.format('sprites'), '')
+        html = SPRITE_REF_RE.sub(
+            lambda m: f'href="#{m.group(2)}"' if m.group(2) in inlined.get(m.group(1), ()) else m.group(0),
+            html)
+        sprite = f'<svg xmlns="http://www.w3.org/2000/svg" style="display:none">{"".join(symbols)}</svg>'
+        return html.replace(MARKER.format('sprites'), sprite)
+
+    def finalize(self, html: str) -> str:
+        """Replace the page tags' markers in ``html`` with the collected assets."""
+        html = html.replace(MARKER.format('css'), self.render_css())
+        html = html.replace(MARKER.format('scripts'), self.render_scripts())
+        if MARKER.format('vite') in html:
+            html = html.replace(MARKER.format('vite'), self.render_vite())
+        if MARKER.format('sprites') in html:
+            html = self.inline_sprites(html)
+        return html
+
@@ -0,0 +1,56 @@
+// Re-renders only the component instances whose .dj source changed.
+// Instances are bracketed by <!--djuno:NAME TOKEN--> ... <!--/djuno:NAME-->
+// comments while DJUNO_ENV=development; TOKEN is the signed props/slots
+// the component endpoint accepts.
+(() => {
+  const script = document.currentScript;
+  const events = new EventSource(script.dataset.events);
+
+  function instances(names) {
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_COMMENT);
+    const found = [];
+    while (walker.nextNode()) {
+      const match = walker.currentNode.data.match(/^djuno:(\S+) (\S+)$/);
+      if (match && names.has(match[1])) {
+        found.push({ start: walker.currentNode, name: match[1], token: match[2] });
+      }
+    }
+    return found;
+  }
+
+  function closing(start, name) {
+    let depth = 0;
+    for (let node = start.nextSibling; node; node = node.nextSibling) {
+      if (node.nodeType !== Node.COMMENT_NODE) continue;
+      if (node.data.startsWith(`djuno:${name} `)) depth++;
+      else if (node.data === `/djuno:${name}`) {
+        if (depth === 0) return node;
+        depth--;
+      }
+    }
+    return null;
+  }
+
+  async function swap({ start, name, token }) {
+    const url = script.dataset.render.replace('__name__', name) + '?token=' + encodeURIComponent(token);
+    const response = await fetch(url, { cache: 'no-store' });
+    const end = closing(start, name);
+    if (!response.ok || !start.isConnected || !end) return;
+    const range = document.createRange();
+    range.setStartBefore(start);
+    range.setEndAfter(end);
+    const fragment = range.createContextualFragment(await response.text());
+    const inserted = Array.from(fragment.childNodes);
+    range.deleteContents();
+    range.insertNode(fragment);
+    if (window.htmx) {
+      inserted.filter((node) => node.nodeType === Node.ELEMENT_NODE).forEach((node) => window.htmx.process(node));
+    }
+  }
+
+  events.addEventListener('component', (event) => {
+    const names = new Set(JSON.parse(event.data));
+    instances(names).forEach(swap);
+    console.info(`[djuno] reloaded ${[...names].join(', ')}`);
+  });
+})();
@@ -0,0 +1,99 @@
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator
+
+from .compiler import file_hash, parse_dj_file
+
+MAGIC = b'DJST'
+HEADER = struct.Struct('<4sI')
+SECTIONS = ('template', 'style', 'script', 'budget', 'fallback')
+
+
+def write_store(path: str, components: Dict[str, Dict[str, str]], versions: Dict[str, str] = None) -> int:
+    """Write compiled sections of many components into one store file.
+
+    The file is a small JSON index followed by the UTF-8 encoded sections
+    laid out back to back, so it can be mapped read-only and shared by
+    every worker process. Returns the number of bytes written.
+    """
+    versions = versions or {}
+    index = {}
+    blobs = []
+    offset = 0
+    for name, sections in sorted(components.items()):
+        entry = {'version': versions.get(name, '')}
+        for section in SECTIONS:
+            data = sections.get(section, '').encode('utf-8')
+            entry[section] = [offset, len(data)]
+            blobs.append(data)
+            offset += len(data)
+        index[name] = entry
+
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(data)
+    return HEADER.size + len(index_bytes) + offset
+
+
+def build_store(file_paths: Dict[str, str], path: str) -> int:
+    """Compile every .dj file in ``file_paths`` into a store at ``path``."""
+    components = {}
+    versions = {}
+    for name, file_path in file_paths.items():
+        components[name] = parse_dj_file(file_path)
+        versions[name] = file_hash(file_path)
+    return write_store(path, components, versions)
+
+
+class ComponentStore:
+    """Read-only, memory-mapped view of a store written by ``write_store``.
+
+    The mapping stays open for the store's lifetime: ``raw`` hands out
+    zero-copy views of the file's pages, which every process that maps the
+    same file shares through the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Djuno component store")
+        start = HEADER.size
+        self.index = json.loads(self.data[start:start + index_size])
+        self.offset = start + index_size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def version(self, name: str) -> str:
+        return self.index[name]['version']
+
+    def is_stale(self, name: str, file_path: str) -> bool:
+        """Whether ``file_path`` changed since ``name`` was written to the store."""
+        return self.version(name) != file_hash(file_path)
+
+    def raw(self, name: str, section: str) -> memoryview:
+        """Zero-copy view of one section's UTF-8 bytes in the mapping."""
+        start, size = self.index[name].get(section, (0, 0))
+        start += self.offset
+        return memoryview(self.data)[start:start + size]
+
+    def sections(self, name: str) -> Dict[str, str]:
+        return {section: str(self.raw(name, section), 'utf-8') for section in SECTIONS}
+
+    def close(self):
+        self.data.close()
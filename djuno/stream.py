@@ -0,0 +1,62 @@
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, Type, Union
+
+from django.http import StreamingHttpResponse
+
+from .component import Component
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def render_rows(
+    rows: Iterable[Any],
+    component: Union[str, Type[Component]],
+    props: Callable[[Any], Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    slots: Callable[[Any], Dict[str, str]] = None
+) -> Iterator[str]:
+    """Render ``component`` once per row, yielding HTML ``chunk_size`` rows at a time.
+
+    A QuerySet is consumed with ``.iterator(chunk_size=...)`` so rows are
+    fetched in batches and never cached; ``props`` (and ``slots``) map each
+    row to the instance's arguments. Every instance shares the class's
+    compiled template, and nothing outlives its chunk, so memory stays
+    flat however many rows there are.
+    """
+    if isinstance(component, str):
+        from .registry import registry
+        component = registry[component]
+    component.partial()
+    if hasattr(rows, 'iterator'):
+        rows = rows.iterator(chunk_size=chunk_size)
+
+    chunk = []
+    for row in rows:
+        chunk.append(component(slots=slots(row) if slots else None, **props(row)).render())
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk.clear()
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_components(
+    rows: Iterable[Any],
+    component: Union[str, Type[Component]],
+    props: Callable[[Any], Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    slots: Callable[[Any], Dict[str, str]] = None,
+    before: str = '',
+    after: str = '',
+    content_type: str = 'text/html; charset=utf-8'
+) -> StreamingHttpResponse:
+    """A streaming response of ``before``, one component per row, then ``after``.
+
+        def orders(request):
+            return stream_components(
+                Order.objects.order_by('-created'), 'order_row',
+                lambda order: {'id': order.pk, 'text': order.title},
+                before='<table>', after='</table>')
+    """
+    body = chain([before], render_rows(rows, component, props, chunk_size, slots), [after])
+    return StreamingHttpResponse((part for part in body if part), content_type=content_type)
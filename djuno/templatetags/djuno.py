@@ -0,0 +1,126 @@
+from typing import List, Set
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from .. import live
+from ..assets import current_usage
+from ..manifest import get_manifest
+from ..registry import registry
+from ..render_context import ASSET_KINDS, MARKER, current_render
+
+register = template.Library()
+
+
+def vite_url(file: str) -> str:
+    return static(getattr(settings, 'DJUNO_VITE_PREFIX', 'vite/') + file)
+
+
+def page_components(context) -> Set[str]:
+    """Components the page template being rendered uses, per the dependency graph.
+
+    The graph is only read here; ``registry.preload``, component reloads
+    and ``djuno graph`` keep it up to date. Components already rendered
+    in this request are included too, for pages the graph doesn't cover.
+    """
+    names = set(current_usage.get() or ())
+    name = getattr(context.template, 'name', None)
+    if name:
+        names |= registry.graph.dependencies(name)
+    return {dep for dep in names if dep in registry.file_paths}
+
+
+def entry_keys(names) -> List[str]:
+    manifest = get_manifest()
+    keys = []
+    for name in names:
+        if name in registry.file_paths:
+            key = manifest.entry_key(registry.file_paths[name])
+            if key:
+                keys.append(key)
+    return keys
+
+
+def component_tag(name: str):
+    def tag(**props):
+        return registry[name](**props).render()
+    tag.__name__ = f'{name}_component'
+    return tag
+
+
+for component_name in registry.file_paths:
+    register.simple_tag(component_tag(component_name),
+                        name=f'{component_name}_component')
+
+
+@register.simple_tag
+def vite_asset(name: str) -> str:
+    """URL of a component's hashed entry bundle."""
+    keys = entry_keys([name])
+    if not keys:
+        return ''
+    return vite_url(get_manifest().load()[keys[0]]['file'])
+
+
+def vite_tags(names) -> str:
+    assets = get_manifest().assets(entry_keys(sorted(names)))
+    return (
+        format_html_join('', '<link rel="stylesheet" href="{}">',
+                         ((vite_url(f),) for f in assets['css']))
+        + format_html_join('', '<link rel="modulepreload" href="{}">',
+                           ((vite_url(f),) for f in assets['preloads']))
+        + format_html_join('', '<script type="module" src="{}"></script>',
+                           ((vite_url(f),) for f in assets['scripts']))
+    )
+
+
+@register.simple_tag(takes_context=True)
+def vite_components(context, *names: str) -> str:
+    """Stylesheets, modulepreload links and entry scripts for components.
+
+    With no names, emits assets for the components the current page uses,
+    so only their import chains are preloaded. Inside a ``RenderContext``
+    the tags are filled in once the page has rendered, from the graph and
+    every component that actually rendered; otherwise only the graph and
+    the components rendered so far are known.
+    """
+    if names:
+        return vite_tags(names)
+    render = current_render.get()
+    if render is not None:
+        render.pages |= page_components(context)
+        return mark_safe(MARKER.format('vite'))
+    return vite_tags(page_components(context))
+
+
+@register.simple_tag
+def djuno_live_reload() -> str:
+    """Client that swaps changed components in place; empty unless DJUNO_ENV=development."""
+    if not live.ENABLED:
+        return ''
+    return format_html(
+        '<script src="{}" data-events="{}" data-render="{}" defer></script>',
+        static('djuno/live-reload.js'),
+        reverse('djuno-live'),
+        reverse('djuno-component', args=['__name__']),
+    )
+
+
+@register.simple_tag
+def djuno_assets(kind: str) -> str:
+    """Where the page's collected ``css``, ``scripts`` or ``sprites`` go.
+
+    Emits a marker that ``RenderContextMiddleware`` (or
+    ``RenderContext.finalize``) replaces after the whole page has rendered;
+    empty outside a render context.
+    """
+    if kind not in ASSET_KINDS:
+        raise template.TemplateSyntaxError(
+            f"djuno_assets expects one of {', '.join(ASSET_KINDS)}, got '{kind}'")
+    if current_render.get() is None:
+        return ''
+    return mark_safe(MARKER.format(kind))
@@ -0,0 +1,123 @@
+import contextvars
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+exporter = None
+
+current_span: contextvars.ContextVar = contextvars.ContextVar(
+    'djuno_span', default=None)
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional['Span'] = None):
+        self.name = name
+        self.parent = parent
+        self.attributes: Dict[str, Any] = {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.handle: Any = None
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, for tests."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        self.spans.append(span)
+
+    def clear(self):
+        self.spans.clear()
+
+
+class OpenTelemetryExporter:
+    """Forwards spans to an OpenTelemetry tracer, keeping parent links."""
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryExporter requires the 'opentelemetry-api' package")
+        self.trace = trace
+        self.tracer = tracer or trace.get_tracer('djuno')
+
+    def on_start(self, span: Span):
+        context = None
+        if span.parent is not None and span.parent.handle is not None:
+            context = self.trace.set_span_in_context(span.parent.handle)
+        span.handle = self.tracer.start_span(
+            span.name, context=context, start_time=span.start_ns)
+
+    def on_end(self, span: Span):
+        span.handle.set_attributes(span.attributes)
+        if span.error is not None:
+            span.handle.record_exception(span.error)
+            span.handle.set_status(self.trace.Status(
+                self.trace.StatusCode.ERROR))
+        span.handle.end(end_time=span.end_ns)
+
+
+def set_exporter(new_exporter):
+    """Install an exporter (``on_start(span)``/``on_end(span)``), or None to disable tracing."""
+    global exporter
+    exporter = new_exporter
+
+
+def set_attribute(key: str, value: Any):
+    """Set an attribute on the innermost active span, if any."""
+    span = current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def traced(
+    name: str,
+    attributes: Callable[..., Dict[str, Any]] = None,
+    result_attributes: Callable[[Any], Dict[str, Any]] = None
+):
+    """Wrap a function in a span named ``name``.
+
+    ``attributes`` receives the call's arguments and returns the span's
+    initial attributes, ``result_attributes`` receives the return value;
+    the function can add more with ``set_attribute``. With no exporter
+    installed the wrapper costs one attribute check.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if exporter is None:
+                return func(*args, **kwargs)
+            active = exporter
+            span = Span(name, current_span.get())
+            if attributes is not None:
+                span.attributes.update(attributes(*args, **kwargs))
+            active.on_start(span)
+            token = current_span.set(span)
+            try:
+                result = func(*args, **kwargs)
+                if result_attributes is not None:
+                    span.attributes.update(result_attributes(result))
+                return result
+            except BaseException as e:
+                span.error = e
+                raise
+            finally:
+                current_span.reset(token)
+                span.end_ns = time.time_ns()
+                active.on_end(span)
+        return wrapper
+    return decorator
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import live_reload, render_component
+
+
+urlpatterns = [
+    path("components/<str:name>/", render_component, name="djuno-component"),
+    path("live/", live_reload, name="djuno-live"),
+]
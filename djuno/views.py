@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Type
+
+from django.conf import settings
+from django.core import signing
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotAllowed,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+
+from . import live
+from .component import TRUE_VALUES, Component, load_lazy_token
+from .graph import template_origins
+from .registry import registry
+
+
+def get_component_props(component: Type[Component], data) -> Dict[str, Any]:
+    """Pick the component's props out of a QueryDict, rejecting unknown keys."""
+    props = {}
+    for key in data:
+        if key not in component.props:
+            raise ValueError(f"Unknown prop '{key}'")
+        value = data.get(key)
+        if component.props[key].type_ is bool:
+            value = value.lower() in TRUE_VALUES
+        props[key] = value
+    return props
+
+
+def component_etag(component: Type[Component], props: Dict[str, Any], slots: Dict[str, str] = None) -> str:
+    """Strong ETag derived from the component version, its props and slots."""
+    payload = json.dumps([props, slots], sort_keys=True, default=str)
+    digest = hashlib.sha1(
+        f"{component.version}:{payload}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def template_source_versions(template: str) -> List[Any]:
+    """Modification time and size of every file rendering ``template`` loads.
+
+    That is the template itself and everything it extends or includes
+    (see ``djuno.graph.template_origins``).
+    """
+    versions = []
+    for name, origin in sorted(template_origins(template).items()):
+        try:
+            stat = os.stat(origin)
+        except (OSError, TypeError):
+            versions.append([name, origin])
+            continue
+        versions.append([name, origin, stat.st_mtime_ns, stat.st_size])
+    return versions
+
+
+def page_fingerprint(components: Iterable[str] = (), props: Dict[str, Any] = None, version: Any = None,
+                     template: str = None) -> str:
+    """Digest of a page's declared inputs and the compile hash of every component it uses.
+
+    Components the declared ones use, per the dependency graph, are
+    included too, so editing a nested component changes the fingerprint.
+    The graph is built on first use if graph.json is missing. ``template``
+    names the page template: the mtime and size of it and of every
+    template it extends or includes are part of the digest, and so are
+    the components the graph says those templates use.
+    """
+    graph = registry.ensure_graph()
+    names = set(components)
+    sources = template_source_versions(template) if template else None
+    for source in sources or ():
+        names |= graph.dependencies(source[0])
+    for name in list(names):
+        names |= graph.dependencies(name)
+    versions = [(name, registry[name].version) for name in sorted(names)
+                if name in registry.components or name in registry.file_paths]
+    payload = json.dumps([versions, props, version, sources], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def component_inputs(inputs: Callable[..., Dict[str, Any]]):
+    """Answer conditional GETs from a view's declared inputs, before it renders.
+
+    ``inputs`` receives the view's arguments and returns the keyword
+    arguments of ``page_fingerprint``: the page ``template``, the
+    ``components`` it renders, the ``props`` it passes them and a
+    ``version`` for any data it shows.
+    A matching ``If-None-Match`` gets a ``304`` without calling the view;
+    other responses carry the fingerprint as their ``ETag``.
+
+        @component_inputs(lambda request: {
+            'template': 'index.html',
+            'components': ['button', 'icon'],
+            'version': Article.objects.latest('updated').updated,
+        })
+        def index(request): ...
+    """
+    def etag(request, *args, **kwargs):
+        return page_fingerprint(**inputs(request, *args, **kwargs))
+    return condition(etag_func=etag)
+
+
+@csrf_exempt
+def render_component(request, name: str) -> HttpResponse:
+    """Render a single registered component as an HTML fragment.
+
+    Props come from the query string or form body, or from a signed
+    ``token`` produced by a lazy component's placeholder. A token only
+    renders the component it was minted for, and expires after
+    DJUNO_LAZY_TOKEN_MAX_AGE seconds.
+    """
+    if request.method not in ('GET', 'HEAD', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'HEAD', 'POST'])
+
+    try:
+        component = registry[name]
+    except KeyError:
+        raise Http404(f"Component '{name}' is not registered")
+
+    data = request.POST if request.method == 'POST' else request.GET
+    try:
+        if 'token' in data:
+            payload = load_lazy_token(name, data['token'])
+            instance = component(slots=payload['slots'], **payload['props'])
+            # The lazy load of a deadline fallback must not fall back again.
+            instance.deadline_ms = None
+        else:
+            instance = component(**get_component_props(component, data))
+    except signing.BadSignature:
+        return HttpResponseBadRequest("Invalid component token")
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    etag = component_etag(component, instance.kwargs, instance.slots)
+    if request.method == 'POST':
+        response = HttpResponse(instance.render())
+        response['ETag'] = etag
+        patch_cache_control(response, no_store=True)
+        return response
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(instance.render())
+    response['ETag'] = etag
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=getattr(settings, 'DJUNO_COMPONENT_MAX_AGE', 300),
+    )
+    return response
+
+
+def live_reload(request) -> StreamingHttpResponse:
+    """Server-sent events naming each component whose source changed.
+
+    Development only (DJUNO_ENV=development): the registry's file watcher
+    publishes reloaded components, and the ``djuno_live_reload`` client
+    re-renders just their instances on the page.
+    """
+    if not live.ENABLED:
+        raise Http404("Live reload requires DJUNO_ENV=development")
+    response = StreamingHttpResponse(live.events(registry), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
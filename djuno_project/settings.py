@@ -49,6 +49,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "djuno.middleware.EarlyHintsMiddleware",
+    "djuno.middleware.RenderContextMiddleware",
 ]
 
 ROOT_URLCONF = "djuno_project.urls"
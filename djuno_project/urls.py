@@ -1,7 +1,8 @@
-from django.urls import path
+from django.urls import include, path
 from .views import index
 
 
 urlpatterns = [
     path("", index, name="index"),
+    path("djuno/", include("djuno.urls")),
 ]
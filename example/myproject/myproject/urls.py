@@ -15,9 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.urls import path
+from django.urls import include, path
 from .views import my_view
 
 urlpatterns = [
-    path('', my_view)
+    path('', my_view),
+    path('djuno/', include('djuno.urls')),
 ]
@@ -0,0 +1,23 @@
+from django.test import TestCase
+from djuno.budget import check_budget, html_depth, measure, story_args
+from djuno.registry import registry
+
+
+class BudgetTest(TestCase):
+    def test_html_depth(self):
+        self.assertEqual(html_depth('<div><p>a<br></p><img src="x"></div>'), 2)
+        self.assertEqual(html_depth('text'), 0)
+
+    def test_story_args(self):
+        stories = story_args('components/button/button.stories.ts')
+        self.assertIn({'text': 'Disabled Button', 'class': 'default', 'disabled': True}, stories)
+
+    def test_declared_budget(self):
+        self.assertIn('max_render_ms', registry['icon'].budget)
+
+    def test_violations(self):
+        measured = measure(registry['icon'], [{'name': 'star'}], runs=2)
+        self.assertEqual(check_budget({'max_bytes': 10 ** 6}, measured), [])
+        violations = check_budget({'max_bytes': 1, 'max_depth': 1}, measured)
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(violations[0].startswith('bytes '))
@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+from django.conf import settings
+from django.test import TestCase
+from djuno.cli import cli
+from djuno.compile_cache import CompileCache
+
+SETTINGS = 'djuno_project.settings'
+
+
+class CliTest(TestCase):
+    """Each command runs in a scratch project linking the repo's components and templates."""
+
+    def setUp(self):
+        self.runner = CliRunner()
+        filesystem = self.runner.isolated_filesystem()
+        self.tmp = Path(filesystem.__enter__())
+        self.addCleanup(filesystem.__exit__, None, None, None)
+        for name in ('components', 'templates'):
+            (self.tmp / name).symlink_to(Path(settings.BASE_DIR) / name)
+
+    def invoke(self, *args):
+        return self.runner.invoke(cli, list(args), catch_exceptions=False)
+
+    def test_cache_stats_prune_clear(self):
+        cache = CompileCache('cache')
+        for key in 'abc':
+            cache.set(key, {'template': key})
+        cache.get('a')
+
+        result = self.invoke('cache', 'stats', '--dir', 'cache')
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Entries: 3', result.output)
+        self.assertIn('1 hits', result.output)
+
+        result = self.invoke('cache', 'prune', '--dir', 'cache', '--max-entries', '1')
+        self.assertIn('Removed 2 cache entries', result.output)
+        result = self.invoke('cache', 'clear', '--dir', 'cache')
+        self.assertIn('Cleared 1 cache entries', result.output)
+        self.assertEqual(CompileCache('cache').stats()['entries'], 0)
+
+    def test_build_store(self):
+        result = self.invoke('build-store', '--output', 'components.store')
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Stored 2 components', result.output)
+        self.assertTrue((self.tmp / 'components.store').stat().st_size > 0)
+
+        result = self.invoke('build-store', '--dir', 'missing')
+        self.assertIn('No components found', result.output)
+
+    def test_css(self):
+        result = self.invoke('css', '--output', 'static/utilities.css')
+        self.assertEqual(result.exit_code, 0, result.output)
+        stylesheet = (self.tmp / 'static' / 'utilities.css').read_text()
+        self.assertIn('.mr-2{margin-right: 0.5rem}', stylesheet)
+        self.assertNotIn('.icon_default_abc123', stylesheet)
+        self.assertIn('rescanned', result.output)
+
+    def test_graph(self):
+        result = self.invoke('graph', 'icon')
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Used by: index.html', result.output)
+        self.assertIn('Invalidates: icon, index.html', result.output)
+        self.assertIn('icon', json.loads((self.tmp / 'djuno/cache/graph.json').read_text()))
+
+        result = self.invoke('graph', 'missing')
+        self.assertIn('not a known component', result.output)
+
+    def test_prerender(self):
+        args = ['prerender', '--component', 'icon', '--prop', 'name=star,heart',
+                '--output', 'out', '--jobs', '1', '--settings', SETTINGS]
+        result = self.invoke(*args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Rendered 2, skipped 0 unchanged', result.output)
+        self.assertTrue((self.tmp / 'out' / 'manifest.json').exists())
+
+        result = self.invoke(*args)
+        self.assertIn('Rendered 0, skipped 2 unchanged', result.output)
+
+        result = self.invoke('prerender', '--settings', SETTINGS)
+        self.assertIn('Nothing to prerender', result.output)
+
+    def test_doctor(self):
+        result = self.invoke('doctor')
+        self.assertIn('djuno doctor --perf', result.output)
+
+        result = self.invoke('doctor', '--perf', '--settings', SETTINGS)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Component renders', result.output)
+        self.assertRegex(result.output, r'button\s+cold')
+
+    def test_check_budget(self):
+        generous = {'max_render_ms': 1000, 'max_bytes': 100000, 'max_css_bytes': 100000, 'max_depth': 100}
+        Path('budgets.json').write_text(json.dumps({
+            'button': {'budget': generous, 'props': [{'text': 'Go'}]},
+            'icon': {'budget': generous, 'props': [{'name': 'star'}]},
+        }))
+        args = ['check', '--budget', '--fixtures', 'budgets.json', '--settings', SETTINGS]
+        result = self.invoke(*args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('✅ button', result.output)
+
+        Path('budgets.json').write_text(json.dumps({
+            'icon': {'budget': {'max_bytes': 1}, 'props': [{'name': 'star'}]},
+        }))
+        result = self.invoke(*args)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('❌ icon', result.output)
+
+    def test_minify_report(self):
+        result = self.invoke('minify-report')
+        self.assertEqual(result.exit_code, 0)
+        self.assertRegex(result.output, r'button\s+\d+\s+\d+')
+        self.assertIn('total', result.output)
+
+    def test_partial_report(self):
+        result = self.invoke('partial-report', '--settings', SETTINGS)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('of 2 components fully precomputed', result.output)
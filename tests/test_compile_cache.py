@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+
+from django.test import TestCase
+from djuno.compile_cache import CompileCache
+
+
+class CompileCacheTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_hit_and_miss(self):
+        cache = CompileCache(self.tmp.name)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', {'template': '<b></b>'})
+        self.assertEqual(cache.get('a'), {'template': '<b></b>'})
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        cache = CompileCache(self.tmp.name, max_entries=2)
+        cache.set('a', {})
+        cache.set('b', {})
+        past = time.time() - 60
+        os.utime(cache.path('a'), (past, past))
+        os.utime(cache.path('b'), (past - 60, past - 60))
+        cache.get('b')
+        cache.set('c', {})
+        self.assertFalse(cache.path('a').exists())
+        self.assertTrue(cache.path('b').exists())
+        self.assertTrue(cache.path('c').exists())
+
+    def test_byte_budget(self):
+        cache = CompileCache(self.tmp.name, max_bytes=0)
+        cache.set('a', {'template': 'x' * 100})
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_prune_and_clear(self):
+        cache = CompileCache(self.tmp.name)
+        for key in 'abc':
+            cache.set(key, {})
+        self.assertEqual(cache.prune(max_entries=1), 2)
+        self.assertEqual(cache.clear(), 1)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_unwritable_cache_dir_is_skipped(self):
+        blocker = os.path.join(self.tmp.name, 'file')
+        open(blocker, 'w').close()
+        cache = CompileCache(os.path.join(blocker, 'cache'))
+        with self.assertLogs('djuno.compile_cache', 'WARNING'):
+            cache.set('a', {'template': '<b></b>'})
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['entries'], 0)
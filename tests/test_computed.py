@@ -0,0 +1,52 @@
+from django.test import TestCase
+from djuno.component import Component, Prop, computed
+from djuno.registry import registry
+
+
+class Badge(Component):
+    template = '<span class="{{ tone_class }}">{{ label }}</span>'
+    props = {
+        'label': Prop(str, default=''),
+        'tone': Prop(str, default='info', choices=['info', 'error']),
+    }
+    calls = 0
+
+    @computed('tone', maxsize=2)
+    def tone_class(self):
+        Badge.calls += 1
+        return f'badge-{self.tone}'
+
+
+class ComputedTest(TestCase):
+    def setUp(self):
+        Badge.partial()
+        Badge.calls = 0
+        Badge.tone_class.cached.cache_clear()
+
+    def test_memoized_across_instances(self):
+        for i in range(100):
+            html = Badge(label=f'#{i}', tone='error').render()
+        self.assertIn('badge-error', html)
+        self.assertEqual(Badge.calls, 1)
+
+    def test_only_declared_props_are_visible(self):
+        class Broken(Badge):
+            @computed('tone')
+            def tone_class(self):
+                return self.label
+
+        with self.assertRaises(AttributeError):
+            Broken(label='x').render()
+
+    def test_cache_is_bounded(self):
+        Badge(tone='info').tone_class
+        Badge(tone='error').tone_class
+        Badge(tone='info').tone_class
+        info = Badge.tone_class.cached.cache_info()
+        self.assertEqual((info.maxsize, info.currsize, info.hits), (2, 2, 1))
+
+    def test_button_js_attrs(self):
+        html = registry['button'](text='Go', js='htmx').render()
+        self.assertIn('hx-swap="outerHTML"', html)
+        html = registry['button'](text='Go', js='alpine').render()
+        self.assertIn('@click="isClicked = !isClicked"', html)
@@ -0,0 +1,65 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from djuno.css import CssBuilder, default_table, expand_apply, extract_candidates, generate, scope_css
+
+
+class UtilityCssTest(TestCase):
+    def test_only_used_utilities(self):
+        css = generate({'p-4', 'hover:bg-gray-200', 'md:w-1/2', 'bogus', '{{', 'unknown:p-4'}, default_table)
+        self.assertIn('.p-4{padding: 1rem}', css)
+        self.assertIn('.hover\\:bg-gray-200:hover{background-color: #e5e7eb}', css)
+        self.assertIn('@media (min-width: 768px) {\n.md\\:w-1\\/2{width: 50%}\n}', css)
+        self.assertNotIn('bogus', css)
+        self.assertNotIn('unknown', css)
+
+    def test_extract_candidates(self):
+        source = '''<div class="{{ class }} mx-auto" :class="{ 'bg-blue-500 text-white': on }">'''
+        self.assertTrue({'mx-auto', 'bg-blue-500', 'text-white'} <= extract_candidates(source))
+
+    def test_extract_candidates_ignores_text_and_other_attributes(self):
+        source = '<p title="block">A static block of text</p>{% icon_component class=\'flex\' %}'
+        self.assertEqual(extract_candidates(source), {'flex'})
+
+    def test_scope_css(self):
+        css = scope_css('.default { x: 1 } .default:hover { x: 2 } .default-x { x: 3 }',
+                        {'default': 'button_default_abc123'})
+        self.assertEqual(css, '.button_default_abc123 { x: 1 } .button_default_abc123:hover { x: 2 } '
+                              '.default-x { x: 3 }')
+
+    def test_expand_apply(self):
+        css = expand_apply('.x { @apply inline-block opacity-50; }', default_table)
+        self.assertEqual(css, '.x { display: inline-block; opacity: 0.5; }')
+        with self.assertRaises(ValueError):
+            expand_apply('.x { @apply no-such-utility; }', default_table)
+
+    def test_custom_table(self):
+        table = default_table.copy()
+        table.add(r'content-auto', 'content-visibility: auto')
+        self.assertIn('.content-auto{content-visibility: auto}', generate({'content-auto'}, table))
+        self.assertEqual(generate({'content-auto'}, default_table), '')
+
+    def test_incremental_build(self):
+        tmp = Path(tempfile.mkdtemp())
+        (tmp / 'templates').mkdir()
+        page = tmp / 'templates' / 'page.html'
+        page.write_text('<p class="p-2">')
+        (tmp / 'templates' / 'other.html').write_text('<p class="m-1">')
+        builder = CssBuilder(cache_path=str(tmp / 'css.json'))
+        builder.build(str(tmp / 'components'), [str(tmp / 'templates')], preflight=False)
+        self.assertEqual(len(builder.rescanned), 2)
+
+        page.write_text('<p class="p-2 text-center">')
+        builder = CssBuilder(cache_path=str(tmp / 'css.json'))
+        css = builder.build(str(tmp / 'components'), [str(tmp / 'templates')], preflight=False)
+        self.assertEqual(builder.rescanned, [str(page)])
+        self.assertIn('.text-center{text-align: center}', css)
+        self.assertIn('.m-1{margin: 0.25rem}', css)
+
+    def test_component_styles_are_left_to_the_render_context(self):
+        tmp = Path(tempfile.mkdtemp())
+        css = CssBuilder(cache_path=str(tmp / 'css.json')).build('components', [], preflight=False)
+        self.assertIn('.mr-2{margin-right: 0.5rem}', css)
+        self.assertNotIn('button_default_abc123', css)
+        self.assertNotIn('icon_default_abc123', css)
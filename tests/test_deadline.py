@@ -0,0 +1,106 @@
+import asyncio
+import tempfile
+import time
+from concurrent import futures
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from djuno import deadline
+from djuno.compiler import parse_dj_file
+from djuno.component import Component, Prop, from_sections
+from djuno.registry import registry
+
+
+class Slow(Component):
+    name = 'slow'
+    template = '<div>{{ text }}</div>'
+    placeholder = '<div class="skeleton"></div>'
+    props = {'text': Prop(str, default='done'), 'delay': Prop(float, default=0.0)}
+    deadline_ms = 50
+
+    def get_context_data(self):
+        # Stands in for slot content that runs queries when rendered.
+        time.sleep(self.kwargs['delay'])
+        return super().get_context_data()
+
+
+class DeadlineTest(TestCase):
+    def setUp(self):
+        deadline.misses.clear()
+
+    def test_fast_render(self):
+        self.assertEqual(Slow().render(), '<div>done</div>')
+        self.assertEqual(deadline.stats(), {})
+
+    def test_slow_render_falls_back(self):
+        start = time.perf_counter()
+        html = Slow(delay=0.5).render()
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(html, '<div class="skeleton"></div>')
+        self.assertEqual(deadline.stats(), {'slow': 1})
+
+    def test_instance_deadline(self):
+        self.assertEqual(Slow(delay=0.1, deadline=500).render(), '<div>done</div>')
+        self.assertEqual(Slow(delay=0.1, deadline=10).render(), '<div class="skeleton"></div>')
+
+    @override_settings(DJUNO_RENDER_DEADLINE_MS=10)
+    def test_default_deadline_from_settings(self):
+        class Unbudgeted(Slow):
+            deadline_ms = None
+
+        self.assertEqual(Unbudgeted(delay=0.1).render(), '<div class="skeleton"></div>')
+
+    def test_queue_time_does_not_count(self):
+        with mock.patch.object(deadline, 'executor', futures.ThreadPoolExecutor(1)):
+            self.assertEqual(Slow(delay=0.3).render(), '<div class="skeleton"></div>')
+            self.assertEqual(Slow(delay=0.01).render(), '<div>done</div>')
+            self.assertEqual(deadline.stats(), {'slow': 1})
+
+    def test_nested_deadlines_render_inline(self):
+        class Outer(Slow):
+            def get_context_data(self):
+                context = super().get_context_data()
+                context['text'] = Slow(text='inner').render()
+                return context
+
+        with mock.patch.object(deadline, 'executor', futures.ThreadPoolExecutor(1)):
+            self.assertEqual(Outer(deadline=500).render(), '<div><div>inner</div></div>')
+
+    def test_async_render(self):
+        self.assertEqual(asyncio.run(Slow().arender()), '<div>done</div>')
+        self.assertEqual(asyncio.run(Slow(delay=0.5).arender()), '<div class="skeleton"></div>')
+        self.assertEqual(deadline.stats(), {'slow': 1})
+
+    def test_async_renders_do_not_block_each_other(self):
+        async def page():
+            start = time.perf_counter()
+            html = await asyncio.gather(*(Slow(delay=0.5).arender() for _ in range(4)))
+            return html, time.perf_counter() - start
+
+        html, elapsed = asyncio.run(page())
+        self.assertEqual(set(html), {'<div class="skeleton"></div>'})
+        self.assertLess(elapsed, 0.4)
+
+    def test_lazy_fallback_loads_full_render(self):
+        class LazySlow(Slow):
+            deadline_lazy = True
+
+        registry.components['slow'] = LazySlow
+        self.addCleanup(registry.components.pop, 'slow')
+        html = LazySlow(delay=0.2).render()
+        self.assertIn('hx-trigger="revealed"', html)
+        url = html.split('hx-get="')[1].split('"')[0].replace('&amp;', '&')
+        self.assertEqual(self.client.get(url).content, b'<div>done</div>')
+
+    def test_declared_in_dj_file(self):
+        path = Path(tempfile.mkdtemp()) / 'card.dj'
+        path.write_text(
+            '<template><div>{{ text }}</div></template>'
+            '<fallback><div class="skeleton"></div></fallback>'
+            '<budget>{"deadline_ms": 25, "deadline_lazy": true}</budget>')
+        sections = parse_dj_file(str(path), use_cache=False)
+        self.assertEqual(sections['fallback'], '<div class="skeleton"></div>')
+        component = from_sections('card', sections)
+        self.assertEqual((component.deadline_ms, component.deadline_lazy), (25, True))
+        self.assertEqual(component.placeholder, '<div class="skeleton"></div>')
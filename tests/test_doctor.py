@@ -0,0 +1,34 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+from djuno import doctor
+from djuno.registry import registry
+
+
+class DoctorTest(TestCase):
+    def test_development_env(self):
+        self.assertEqual(doctor.check_environment(None), [])
+        finding = doctor.check_environment('development')[0]
+        self.assertGreater(finding['cost_ms'], 0)
+
+    def test_missing_compile_cache_that_can_be_created(self):
+        missing = os.path.join(tempfile.mkdtemp(), 'missing', 'components')
+        with mock.patch.object(doctor.compile_cache, 'cache_dir', doctor.Path(missing)):
+            self.assertEqual(doctor.check_compile_cache(registry), [])
+        self.assertFalse(os.path.exists(missing))
+
+    def test_uncreatable_compile_cache(self):
+        blocker = os.path.join(tempfile.mkdtemp(), 'file')
+        open(blocker, 'w').close()
+        with mock.patch.object(doctor.compile_cache, 'cache_dir', doctor.Path(blocker, 'cache')):
+            findings = doctor.check_compile_cache(registry)
+        self.assertIn('cannot be created', findings[0]['title'])
+
+    def test_audit_ranks_findings(self):
+        report = doctor.audit(registry, 'development')
+        costs = [f['cost_ms'] for f in report['findings']]
+        self.assertEqual(costs, sorted(costs, reverse=True))
+        self.assertIn('DJUNO_ENV=development is set', [f['title'] for f in report['findings']])
+        self.assertEqual({t['name'] for t in report['renders']}, set(registry.file_paths))
@@ -0,0 +1,133 @@
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import translation
+from djuno.donut import donut_cache
+from djuno.middleware import RenderContextMiddleware
+from djuno.registry import registry
+from djuno.render_context import MARKER
+
+
+class DonutCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def make_view(self):
+        @donut_cache(holes={'greeting': lambda request: {'text': request.GET.get('user', 'anon')}})
+        def view(request):
+            self.calls += 1
+            header = registry['button'](text='Static').render()
+            greeting = registry['button'](text='placeholder', hole='greeting').render()
+            return HttpResponse(f'<main>{header}<p>{greeting}</p></main>')
+        return view
+
+    def test_shell_is_cached_and_holes_rendered_per_request(self):
+        view = self.make_view()
+        factory = RequestFactory()
+
+        first = view(factory.get('/', {'user': 'ana'})).content.decode()
+        self.assertIn('ana', first)
+        self.assertIn('Static', first)
+        self.assertNotIn('djuno-hole', first)
+
+        view(factory.get('/', {'user': 'ana'}))
+        self.assertEqual(self.calls, 1)
+
+    def test_holes_use_the_current_request_props(self):
+        @donut_cache(holes={'greeting': lambda request: {'text': request.headers['X-User']}})
+        def view(request):
+            self.calls += 1
+            return HttpResponse(registry['button'](text='first', hole='greeting').render())
+
+        factory = RequestFactory()
+        view(factory.get('/', HTTP_X_USER='ana'))
+        second = view(factory.get('/', HTTP_X_USER='bob')).content.decode()
+        self.assertEqual(self.calls, 1)
+        self.assertIn('bob', second)
+        self.assertNotIn('ana', second)
+
+    def test_hole_without_props_callable_is_rejected(self):
+        @donut_cache()
+        def view(request):
+            return HttpResponse(registry['button'](text='ana', hole='greeting').render())
+
+        with self.assertRaises(ImproperlyConfigured):
+            view(RequestFactory().get('/'))
+
+    def test_headers_are_restored_and_cookie_responses_not_cached(self):
+        @donut_cache()
+        def view(request):
+            self.calls += 1
+            response = HttpResponse('<p>page</p>')
+            response['Vary'] = 'Accept-Language'
+            response['Cache-Control'] = 'max-age=60'
+            if request.GET.get('login'):
+                response.set_cookie('sessionid', 'secret')
+            return response
+
+        factory = RequestFactory()
+        view(factory.get('/'))
+        cached = view(factory.get('/'))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(cached['Vary'], 'Accept-Language')
+        self.assertEqual(cached['Cache-Control'], 'max-age=60')
+
+        first = view(factory.get('/', {'login': '1'}))
+        self.assertIn('sessionid', first.cookies)
+        second = view(factory.get('/', {'login': '1'}))
+        self.assertEqual(self.calls, 3)
+        self.assertIn('sessionid', second.cookies)
+
+    def test_shells_are_keyed_by_vary_headers_and_host(self):
+        @donut_cache()
+        def view(request):
+            self.calls += 1
+            response = HttpResponse(f"<p>{request.headers.get('X-Theme')}</p>")
+            response['Vary'] = 'X-Theme'
+            return response
+
+        factory = RequestFactory()
+        view(factory.get('/', HTTP_X_THEME='dark'))
+        self.assertIn('dark', view(factory.get('/', HTTP_X_THEME='dark')).content.decode())
+        self.assertEqual(self.calls, 1)
+        self.assertIn('light', view(factory.get('/', HTTP_X_THEME='light')).content.decode())
+        self.assertEqual(self.calls, 2)
+        with self.settings(ALLOWED_HOSTS=['other.example']):
+            view(factory.get('/', HTTP_X_THEME='dark', HTTP_HOST='other.example'))
+        self.assertEqual(self.calls, 3)
+
+    def test_accept_language_is_keyed_by_the_active_language(self):
+        @donut_cache()
+        def view(request):
+            self.calls += 1
+            response = HttpResponse(f'<p>{translation.get_language()}</p>')
+            response['Vary'] = 'Accept-Language'
+            return response
+
+        factory = RequestFactory()
+        for language in ('en', 'fr', 'en'):
+            # LocaleMiddleware activates the request's language the same way.
+            with translation.override(language):
+                self.assertIn(language, view(factory.get('/')).content.decode())
+        self.assertEqual(self.calls, 2)
+
+    def test_holes_render_normally_outside_capture(self):
+        html = registry['button'](text='Plain', hole='greeting').render()
+        self.assertIn('Plain', html)
+
+    def test_cached_shell_keeps_component_assets(self):
+        @donut_cache(holes={'greeting': lambda request: {'text': 'hi'}})
+        def view(request):
+            self.calls += 1
+            icon = registry['icon'](name='star').render()
+            greeting = registry['button'](text='hi', hole='greeting').render()
+            return HttpResponse(f'<head>{MARKER.format("css")}</head>{icon}{greeting}')
+
+        handler = RenderContextMiddleware(view)
+        first = handler(RequestFactory().get('/')).content.decode()
+        second = handler(RequestFactory().get('/')).content.decode()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first, second)
+        self.assertIn('icon_default_abc123', second.split('</head>')[0])
@@ -0,0 +1,65 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from djuno.graph import DependencyGraph, extract_references
+
+
+class DependencyGraphTest(TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.components = {}
+        for name, template in {
+            'icon': '<svg></svg>',
+            'button': '<button>{% icon_component name="star" %}</button>',
+            'card': '<div><button_component text="Go"></button_component></div>',
+        }.items():
+            path = self.tmp / name / f'{name}.dj'
+            path.parent.mkdir()
+            path.write_text(
+                f'<template>{template}</template><script>/* <card_component> */</script>')
+            self.components[name] = str(path)
+        (self.tmp / 'templates').mkdir()
+        (self.tmp / 'templates' / 'page.html').write_text('<card_component></card_component>')
+
+    def make_graph(self):
+        graph = DependencyGraph(str(self.tmp / 'graph.json'))
+        graph.update(self.components, [str(self.tmp / 'templates')])
+        return graph
+
+    def test_extract_references(self):
+        self.assertEqual(
+            extract_references('<button_component/>{% icon_component name="x" %}'),
+            {'button', 'icon'})
+
+    def test_transitive_dependents(self):
+        graph = self.make_graph()
+        self.assertEqual(graph.invalidated_by('icon'), {'icon', 'button', 'card', 'page.html'})
+        self.assertEqual(graph.invalidated_by('card'), {'card', 'page.html'})
+        self.assertEqual(graph.dependencies('page.html'), {'card', 'button', 'icon'})
+
+    def test_only_changed_files_are_rescanned(self):
+        graph = self.make_graph()
+        graph.save()
+        Path(self.components['card']).write_text('<template><div></div></template>')
+        graph = DependencyGraph(str(self.tmp / 'graph.json'))
+        changed = graph.update(self.components, [str(self.tmp / 'templates')])
+        self.assertEqual(changed, ['card'])
+        self.assertEqual(graph.invalidated_by('icon'), {'icon', 'button'})
+
+    def test_partial_update_keeps_other_nodes(self):
+        graph = self.make_graph()
+        graph.update(self.components)
+        self.assertIn('page.html', graph.invalidated_by('icon'))
+
+        (self.tmp / 'templates' / 'page.html').unlink()
+        graph.update(self.components)
+        self.assertNotIn('page.html', graph.nodes)
+
+    def test_unwritable_path_keeps_nodes_in_memory(self):
+        (self.tmp / 'file').write_text('')
+        graph = DependencyGraph(str(self.tmp / 'file' / 'graph.json'))
+        graph.update(self.components, [str(self.tmp / 'templates')])
+        with self.assertLogs('djuno.graph', 'WARNING'):
+            graph.save()
+        self.assertIn('card', graph.dependents('button'))
@@ -0,0 +1,70 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import TestCase
+from djuno import live
+from djuno.registry import ComponentRegistry, registry
+
+
+class LiveReloadTest(TestCase):
+    def make_registry(self):
+        base = Path(tempfile.mkdtemp())
+        for name, template in {'badge': '<b>{{ text }}</b>', 'card': '<div><badge_component/></div>'}.items():
+            (base / name).mkdir()
+            (base / name / f'{name}.dj').write_text(f'<template>{template}</template>')
+        components = ComponentRegistry(str(base))
+        components.graph.path = base / 'graph.json'
+        self.addCleanup(components.stop_watching)
+        return base, components
+
+    def test_reload_announces_affected_components(self):
+        base, components = self.make_registry()
+        components['badge'], components['card']
+        listener = components.subscribe()
+        changed = components.reload([str(base / 'badge' / 'badge.dj'), str(base / 'badge' / 'badge.stories.ts')])
+        self.assertEqual(changed, ['badge', 'card'])
+        self.assertEqual(listener.get_nowait(), ['badge', 'card'])
+        self.assertNotIn('badge', components.components)
+
+    def test_watcher_runs_in_background(self):
+        with mock.patch.object(live, 'ENABLED', True):
+            start = time.perf_counter()
+            base, components = self.make_registry()
+            self.assertLess(time.perf_counter() - start, 1)
+        self.assertTrue(components.watcher.is_alive())
+        listener = components.subscribe()
+        time.sleep(0.2)
+        (base / 'badge' / 'badge.dj').write_text('<template><i>{{ text }}</i></template>')
+        self.assertIn('badge', listener.get(timeout=10))
+
+    def test_render_markers_round_trip(self):
+        with mock.patch.object(live, 'ENABLED', True):
+            html = registry['icon'](name='star').render()
+            self.assertTrue(html.startswith('<!--djuno:icon '))
+            self.assertTrue(html.endswith('<!--/djuno:icon-->'))
+            token = html[len('<!--djuno:icon '):html.index('-->')]
+            response = self.client.get('/djuno/components/icon/', {'token': token})
+        self.assertEqual(response.content.decode(), html)
+
+    def test_events_endpoint(self):
+        self.assertEqual(self.client.get('/djuno/live/').status_code, 404)
+        with mock.patch.object(live, 'ENABLED', True):
+            response = self.client.get('/djuno/live/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 1000\n\n')
+        registry.publish(['button'])
+        self.assertEqual(next(stream), b'event: component\ndata: ["button"]\n\n')
+        response.close()
+        self.assertEqual(registry.listeners, [])
+
+    def test_client_tag(self):
+        html = Template('{% load djuno %}{% djuno_live_reload %}').render(Context())
+        self.assertEqual(html, '')
+        with mock.patch.object(live, 'ENABLED', True):
+            html = Template('{% load djuno %}{% djuno_live_reload %}').render(Context())
+        self.assertIn('data-events="/djuno/live/"', html)
+        self.assertIn('data-render="/djuno/components/__name__/"', html)
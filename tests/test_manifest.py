@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from djuno.manifest import ViteManifest, manifests
+
+MANIFEST = {
+    'components/button/button.dj': {
+        'file': 'assets/button-1a2b.js', 'isEntry': True,
+        'imports': ['_shared-3c4d.js'], 'css': ['assets/button-5e6f.css'],
+    },
+    'components/icon/icon.dj': {
+        'file': 'assets/icon-7a8b.js', 'isEntry': True, 'imports': ['_shared-3c4d.js'],
+    },
+    '_shared-3c4d.js': {'file': 'assets/shared-3c4d.js', 'imports': ['_base-9d0e.js']},
+    '_base-9d0e.js': {'file': 'assets/base-9d0e.js', 'css': ['assets/base-1f2a.css']},
+}
+
+
+class ViteManifestTest(TestCase):
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp()) / 'manifest.json'
+        self.path.write_text(json.dumps(MANIFEST))
+        manifests.clear()
+
+    def test_assets(self):
+        assets = ViteManifest(str(self.path)).assets(['components/button/button.dj'])
+        self.assertEqual(assets['scripts'], ['assets/button-1a2b.js'])
+        self.assertEqual(assets['preloads'], ['assets/shared-3c4d.js', 'assets/base-9d0e.js'])
+        self.assertEqual(assets['css'], ['assets/button-5e6f.css', 'assets/base-1f2a.css'])
+
+    def test_reloads_on_mtime_change(self):
+        manifest = ViteManifest(str(self.path))
+        self.assertIn('_base-9d0e.js', manifest.load())
+        self.path.write_text(json.dumps({'x.dj': {'file': 'x.js'}}))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(list(manifest.load()), ['x.dj'])
+
+    def test_template_tag(self):
+        with override_settings(DJUNO_VITE_MANIFEST=str(self.path)):
+            html = Template('{% load djuno %}{% vite_components "icon" %}').render(Context())
+        self.assertIn('<link rel="modulepreload" href="/static/vite/assets/shared-3c4d.js">', html)
+        self.assertIn('<script type="module" src="/static/vite/assets/icon-7a8b.js"></script>', html)
+        self.assertNotIn('button', html)
+
+    def test_page_tag_covers_components_rendered_after_it(self):
+        from djuno.render_context import RenderContext
+
+        page = Template('{% load djuno %}<head>{% vite_components %}</head>{% icon_component name="star" %}')
+        with override_settings(DJUNO_VITE_MANIFEST=str(self.path)), RenderContext() as render:
+            html = render.finalize(page.render(Context()))
+        self.assertIn('<script type="module" src="/static/vite/assets/icon-7a8b.js"></script>', html)
+        self.assertNotIn('button-1a2b.js', html)
@@ -0,0 +1,18 @@
+from django.test import TestCase, override_settings
+
+
+@override_settings(MIDDLEWARE=['djuno.middleware.EarlyHintsMiddleware'])
+class EarlyHintsMiddlewareTest(TestCase):
+    url = '/djuno/components/icon/'
+
+    def test_link_header_from_previous_render(self):
+        first = self.client.get(self.url, {'name': 'star'})
+        self.assertNotIn('Link', first)
+
+        second = self.client.get(self.url, {'name': 'heart'})
+        self.assertIn('</static/icons.svg>; rel=preload; as=image', second['Link'])
+
+    def test_unrouted_requests_are_ignored(self):
+        self.client.get('/missing/')
+        response = self.client.get('/missing/')
+        self.assertNotIn('Link', response)
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from djuno.minify import minify_report, minify_template
+
+
+class MinifyTemplateTest(TestCase):
+    def test_collapses_whitespace_and_comments(self):
+        html = minify_template('''
+            <div>
+              <!-- note -->
+              <span>{{ text }}</span>   <span>b</span>
+            </div>
+        ''')
+        self.assertEqual(
+            html, '<div><span>{{ text }}</span> <span>b</span></div>')
+
+    def test_preserves_pre_and_textarea(self):
+        source = '<pre>  a\n  b</pre>\n\n<textarea>\n x </textarea>'
+        html = minify_template(source)
+        self.assertIn('<pre>  a\n  b</pre>', html)
+        self.assertIn('<textarea>\n x </textarea>', html)
+
+    def test_preserves_django_tags(self):
+        source = '<span {% if id %}id="{{ id }}"{% endif %}>{{ a|default:"  x  " }}</span>'
+        self.assertEqual(minify_template(source), source)
+
+    def test_keeps_conditional_comments(self):
+        self.assertIn('<!--[if IE]>', minify_template('<!--[if IE]><p>x</p><![endif]-->'))
+
+    def test_report(self):
+        report = minify_report({'template': '<div>\n    <p>x</p>\n</div>'})
+        self.assertEqual(report['minified'], len('<div><p>x</p></div>'))
+        self.assertEqual(report['saved'], report['original'] - report['minified'])
+
+    def test_preserves_attribute_values_and_option_text(self):
+        source = ('<select><option> a  b </option></select>'
+                  '<div title="two  spaces" x-data="{ open:\n false }"></div>')
+        html = minify_template(source)
+        self.assertIn('<option> a b </option>', html)
+        self.assertIn('title="two  spaces"', html)
+        self.assertIn('x-data="{ open:\n false }"', html)
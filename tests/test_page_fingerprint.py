@@ -0,0 +1,115 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from djuno.registry import registry
+from djuno.views import component_inputs, page_fingerprint
+
+
+class PageFingerprintTest(TestCase):
+    def setUp(self):
+        self.renders = 0
+        self.version = 1
+
+        @component_inputs(lambda request: {
+            'components': ['button'],
+            'props': {'text': request.GET.get('text', 'Go')},
+            'version': self.version,
+        })
+        def page(request):
+            self.renders += 1
+            return HttpResponse(registry['button'](text=request.GET.get('text', 'Go')).render())
+
+        self.view = page
+        self.factory = RequestFactory()
+
+    def test_not_modified_without_rendering(self):
+        response = self.view(self.factory.get('/'))
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = self.view(self.factory.get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.renders, 1)
+
+    def test_inputs_change_fingerprint(self):
+        etag = self.view(self.factory.get('/'))['ETag']
+        self.assertEqual(self.view(self.factory.get('/?text=Stop', HTTP_IF_NONE_MATCH=etag)).status_code, 200)
+        self.version = 2
+        self.assertEqual(self.view(self.factory.get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 200)
+        self.assertEqual(self.renders, 3)
+
+    def test_component_versions(self):
+        before = page_fingerprint(['icon'])
+        original = registry['icon']
+        changed = type('Icon', (original,), {'version': 'edited'})
+        registry.components['icon'] = changed
+        self.addCleanup(registry.components.__setitem__, 'icon', original)
+        self.assertNotEqual(page_fingerprint(['icon']), before)
+
+    def test_nested_components(self):
+        node = {'uses': ['icon'], 'component': True, 'hash': '', 'file': ''}
+        with mock.patch.dict(registry.graph.nodes, {'button': node}):
+            before = page_fingerprint(['button'])
+            original = registry['icon']
+            registry.components['icon'] = type('Icon', (original,), {'version': 'edited'})
+            self.addCleanup(registry.components.__setitem__, 'icon', original)
+            self.assertNotEqual(page_fingerprint(['button']), before)
+
+    def test_template_source(self):
+        directory = Path(tempfile.mkdtemp())
+        page = directory / 'page.html'
+        page.write_text('<p>one</p>')
+        with self.settings(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [str(directory)],
+        }]):
+            before = page_fingerprint(template='page.html')
+            page.write_text('<p>two, longer</p>')
+            os.utime(page, ns=(0, 0))
+            self.assertNotEqual(page_fingerprint(template='page.html'), before)
+
+    def test_parent_template_source(self):
+        directory = Path(tempfile.mkdtemp())
+        (directory / 'base.html').write_text('<html>{% block content %}{% endblock %}</html>')
+        (directory / 'page.html').write_text("{% extends 'base.html' %}{% block content %}x{% endblock %}")
+        with self.settings(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [str(directory)],
+        }]):
+            before = page_fingerprint(template='page.html', components=['button'])
+            with open(directory / 'base.html', 'a') as f:
+                f.write('<footer></footer>')
+            self.assertNotEqual(page_fingerprint(template='page.html', components=['button']), before)
+
+    def test_unwritable_graph_is_built_in_memory(self):
+        original = registry.graph.path, registry.graph.nodes
+        directory = Path(tempfile.mkdtemp())
+        (directory / 'cache').write_text('')
+        registry.graph.path = directory / 'cache' / 'graph.json'
+        registry.graph.nodes = {}
+        self.addCleanup(setattr, registry.graph, 'path', original[0])
+        self.addCleanup(setattr, registry.graph, 'nodes', original[1])
+        with self.assertLogs('djuno.graph', 'WARNING'):
+            page_fingerprint(template='index.html')
+        self.assertIn('icon', registry.graph.dependencies('index.html'))
+
+    def test_missing_graph_is_built(self):
+        original = registry.graph.nodes
+        registry.graph.nodes = {}
+        self.addCleanup(setattr, registry.graph, 'nodes', original)
+        with mock.patch.object(registry.graph, 'save'):
+            page_fingerprint(['button'])
+        self.assertIn('icon', registry.graph.dependencies('index.html'))
+
+    def test_template_dependencies(self):
+        node = {'uses': ['icon'], 'component': False, 'hash': '', 'file': ''}
+        with mock.patch.dict(registry.graph.nodes, {'index.html': node}):
+            before = page_fingerprint(template='index.html')
+            original = registry['icon']
+            registry.components['icon'] = type('Icon', (original,), {'version': 'edited'})
+            self.addCleanup(registry.components.__setitem__, 'icon', original)
+            self.assertNotEqual(page_fingerprint(template='index.html'), before)
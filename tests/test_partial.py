@@ -0,0 +1,59 @@
+import itertools
+
+from django import template
+from django.test import TestCase
+from djuno.component import Component, Prop, from_sections
+from djuno.partial import build_partial
+from djuno.registry import registry
+
+
+def full_render(component):
+    return template.Template(component.template).render(
+        template.Context(component.get_context_data()))
+
+
+class PartialTemplateTest(TestCase):
+    def test_button_variants(self):
+        partial = build_partial(registry['button'])
+        # js_attrs posts every prop back in htmx mode, so it is filled in per render.
+        self.assertEqual(partial.dims, {'disabled': [False, True]})
+        self.assertEqual(partial.bits, ['icon', 'id'])
+        self.assertEqual(len(partial.variants), 8)
+        self.assertTrue(partial.complete)
+
+    def test_matches_full_render(self):
+        button = registry['button']
+        for js, disabled, id_, icon, slots in itertools.product(
+            [None, 'none', 'alpine', 'htmx'], [None, True, 'false'], [None, '', 'a"b'],
+            [None, '<b>'], [None, {'header': '<i>'}, {'js': 'x'}, {'styles': 'x'}],
+        ):
+            component = button(slots=slots, text='a&b', js=js, disabled=disabled, id=id_, icon=icon)
+            self.assertEqual(component.render(), full_render(component))
+
+    def test_structural_tags_stay_dynamic(self):
+        component = from_sections('loop', {
+            'template': '<ul>{% for i in text %}<li>{{ i }}</li>{% endfor %}{% if disabled %}!{% endif %}</ul>',
+            'style': '', 'script': '',
+        })
+        partial = component.partial()
+        self.assertFalse(partial.complete)
+        self.assertEqual(partial.dims, {'disabled': [False, True]})
+        instance = component(text='ab', disabled=True)
+        self.assertEqual(instance.render(), '<ul><li>a</li><li>b</li>!</ul>')
+
+    def test_too_many_variants(self):
+        partial = build_partial(registry['button'], max_variants=4)
+        self.assertEqual(list(partial.variants), [()])
+        component = registry['button'](text='Save', js='htmx')
+        self.assertEqual(partial.render(component.get_context_data()), full_render(component))
+
+    def test_custom_context_is_not_folded(self):
+        class Custom(Component):
+            template = '{% if disabled %}off{% else %}{{ text }}{% endif %}'
+            props = {'disabled': Prop(bool, default=False), 'text': Prop(str)}
+
+            def get_context_data(self):
+                return {**super().get_context_data(), 'disabled': True}
+
+        self.assertEqual(Custom.partial().dims, {})
+        self.assertEqual(Custom(text='on').render(), 'off')
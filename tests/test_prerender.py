@@ -0,0 +1,59 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from djuno.prerender import (component_targets, fingerprint, parse_prop_values, prerender,
+                              template_targets, url_targets)
+from djuno.registry import registry
+
+
+class PrerenderTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_sprite_prop_values(self):
+        self.assertIn('star', parse_prop_values('@static/icons.svg'))
+        self.assertEqual(parse_prop_values('a,b'), ['a', 'b'])
+
+    def test_component_targets(self):
+        targets = component_targets('icon', {'name': ['star'], 'class': ['a', 'b']})
+        self.assertEqual([t['key'] for t in targets],
+                         ['icon;class=a;name=star', 'icon;class=b;name=star'])
+
+    def test_renders_and_skips_unchanged(self):
+        targets = component_targets('icon', {'name': ['star']})
+        result = prerender(targets, self.tmp.name, registry.file_paths, jobs=1)
+        self.assertEqual(result['rendered'], ['icon;name=star'])
+
+        manifest = json.loads((Path(self.tmp.name) / 'manifest.json').read_text())
+        file_name = manifest['icon;name=star']['file']
+        self.assertRegex(file_name, r'^icon-name-star\.[0-9a-f]{12}\.html$')
+        self.assertIn('svg', (Path(self.tmp.name) / file_name).read_text())
+
+        result = prerender(targets, self.tmp.name, registry.file_paths, jobs=1)
+        self.assertEqual(result['skipped'], ['icon;name=star'])
+
+    def test_fingerprint_follows_extends_and_include(self):
+        templates = Path(self.tmp.name) / 'templates'
+        templates.mkdir()
+        (templates / 'base.html').write_text('<html>{% block content %}{% endblock %}</html>')
+        (templates / 'footer.html').write_text('<footer></footer>')
+        (templates / 'page.html').write_text(
+            "{% extends 'base.html' %}{% block content %}{% include 'footer.html' %}{% endblock %}")
+        with self.settings(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [str(templates)],
+        }]):
+            page, = template_targets(['page.html'])
+            url, = url_targets(['/'])
+            before = [fingerprint(target, registry.file_paths) for target in (page, url)]
+            (templates / 'base.html').write_text('<html><body>{% block content %}{% endblock %}</body></html>')
+            middle = [fingerprint(target, registry.file_paths) for target in (page, url)]
+            (templates / 'footer.html').write_text('<footer>new</footer>')
+            after = [fingerprint(target, registry.file_paths) for target in (page, url)]
+        for first, second in zip(before, middle):
+            self.assertNotEqual(first, second)
+        for first, second in zip(middle, after):
+            self.assertNotEqual(first, second)
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from django.test import TestCase
+from djuno import registry as registry_module
+from djuno.registry import ComponentRegistry
+
+THREADS = 32
+
+
+class ComponentRegistryTest(TestCase):
+    def setUp(self):
+        self.registry = ComponentRegistry('components')
+        self.compiled = Counter()
+        from_dj_file = registry_module.from_dj_file
+
+        def slow_compile(file_path):
+            self.compiled[file_path] += 1
+            time.sleep(0.01)
+            return from_dj_file(file_path)
+
+        patcher = mock.patch.object(registry_module, 'from_dj_file', slow_compile)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def hammer(self, names):
+        barrier = threading.Barrier(THREADS)
+        results = [None] * THREADS
+        errors = []
+
+        def worker(i):
+            barrier.wait()
+            try:
+                results[i] = [self.registry[name] for name in names]
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_cold_registry_compiles_each_component_once(self):
+        names = sorted(self.registry.file_paths)
+        results = self.hammer(names)
+        self.assertEqual(set(self.compiled.values()), {1})
+        self.assertEqual(len(self.compiled), len(names))
+        for result in results:
+            for name, component in zip(names, result):
+                self.assertIs(component, self.registry.components[name])
+
+    def test_warm_lookup_takes_no_lock(self):
+        self.registry['button']
+        with mock.patch.object(self.registry, 'compile') as compile:
+            self.hammer(['button'])
+        compile.assert_not_called()
+
+    def test_recompiles_after_invalidate(self):
+        self.registry['icon']
+        self.registry.components.pop('icon')
+        self.hammer(['icon'])
+        self.assertEqual(self.compiled[self.registry.file_paths['icon']], 2)
+
+    def test_private_registry_leaves_the_global_one_alone(self):
+        before = registry_module.registry['icon']
+        self.assertIsNot(self.registry['icon'], before)
+        self.assertIs(registry_module.registry['icon'], before)
@@ -0,0 +1,93 @@
+import threading
+from unittest import mock
+
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from djuno.registry import registry
+from djuno.render_context import RenderContext, current_render
+
+PAGE = (
+    "{% load djuno %}<head>{% djuno_assets 'css' %}</head>"
+    "<body>{% djuno_assets 'sprites' %}{% icon_component name='star' %}"
+    "{% icon_component name='star' %}{% djuno_assets 'scripts' %}</body>"
+)
+
+
+class RenderContextTest(TestCase):
+    def test_identical_renders_are_memoized(self):
+        with RenderContext() as render:
+            with mock.patch.object(registry['icon'], 'render_content',
+                                   autospec=True, side_effect=registry['icon'].render_content) as content:
+                first = registry['icon'](name='star').render()
+                second = registry['icon'](name='star').render()
+                registry['icon'](name='heart').render()
+        self.assertEqual(first, second)
+        self.assertEqual(content.call_count, 2)
+        self.assertEqual(render.hits, 1)
+        self.assertEqual(set(render.components), {'icon'})
+        self.assertIsNone(current_render.get())
+
+    def test_memo_is_bounded(self):
+        with RenderContext(max_renders=1) as render:
+            registry['icon'](name='star').render()
+            registry['icon'](name='heart').render()
+        self.assertEqual(len(render.renders), 1)
+
+    def test_no_leakage_across_threads(self):
+        seen = []
+
+        def worker():
+            seen.append(current_render.get())
+            with RenderContext() as render:
+                registry['icon'](name='star').render()
+                seen.append(render.hits)
+
+        with RenderContext():
+            registry['icon'](name='star').render()
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None, 0])
+
+    def test_finalize_fills_in_assets(self):
+        template = engines['django'].from_string(PAGE)
+        with RenderContext() as render:
+            html = render.finalize(template.render({}))
+        self.assertNotIn('djuno-assets', html)
+        self.assertIn('<style>', html)
+        self.assertIn('display:inline-block', html.replace(' ', ''))
+        self.assertIn('<symbol id="star"', html)
+        self.assertIn('href="#star"', html)
+        self.assertNotIn('icons.svg#star', html)
+
+    def test_tags_are_empty_outside_a_context(self):
+        html = engines['django'].from_string(PAGE).render({})
+        self.assertNotIn('djuno-assets', html)
+        self.assertIn('icons.svg#star', html)
+
+
+@override_settings(MIDDLEWARE=['djuno.middleware.RenderContextMiddleware'])
+class RenderContextMiddlewareTest(TestCase):
+    url = '/djuno/components/icon/'
+
+    def test_each_request_gets_its_own_context(self):
+        contexts = []
+        original = RenderContext.add
+
+        def add(render, *args):
+            contexts.append(render)
+            return original(render, *args)
+
+        with mock.patch.object(RenderContext, 'add', add):
+            self.client.get(self.url, {'name': 'star'})
+            self.client.get(self.url, {'name': 'star'})
+        self.assertEqual(len(contexts), 2)
+        self.assertIsNot(contexts[0], contexts[1])
+        self.assertIsNone(current_render.get())
+
+    def test_placeholders_still_record_the_component(self):
+        with RenderContext() as render:
+            registry['icon'](name='star', lazy=True).render()
+        self.assertEqual(set(render.components), {'icon'})
+        self.assertIn('icon_default_abc123', render.render_css())
@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from djuno.compiler import file_hash
+from djuno.registry import ComponentRegistry
+from djuno.store import ComponentStore, write_store
+
+SECTIONS = {'template': '<i>from store</i>', 'style': '', 'script': ''}
+
+
+class ComponentStoreTest(TestCase):
+    def setUp(self):
+        self.path = str(Path(tempfile.mkdtemp()) / 'components.store')
+        self.registry = ComponentRegistry('components')
+
+    def tearDown(self):
+        if self.registry.store is not None:
+            self.registry.store.close()
+
+    def test_preload_reads_matching_entries_and_keeps_the_mapping(self):
+        write_store(self.path, {'icon': SECTIONS},
+                    {'icon': file_hash(self.registry.file_paths['icon'])})
+        self.registry.preload(self.path)
+        self.assertEqual(self.registry['icon'].template, '<i>from store</i>')
+        self.assertEqual(bytes(self.registry.store.raw('icon', 'template')), b'<i>from store</i>')
+
+    def test_stale_entries_are_compiled_from_the_file(self):
+        write_store(self.path, {'icon': SECTIONS}, {'icon': 'outdated'})
+        with self.assertLogs('djuno.compiler', 'WARNING'):
+            self.registry.preload(self.path)
+        self.assertIn('icons.svg', self.registry['icon'].template)
+        self.assertIn('button', self.registry.components)
+
+    def test_raw_is_zero_copy(self):
+        write_store(self.path, {'icon': SECTIONS}, {'icon': ''})
+        store = ComponentStore(self.path)
+        view = store.raw('icon', 'template')
+        self.assertIsInstance(view, memoryview)
+        view.release()
+        store.close()
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from djuno.registry import registry
+from djuno.stream import render_rows, stream_components
+
+
+def user_props(user):
+    return {'text': user.username, 'id': f'user-{user.pk}'}
+
+
+class StreamComponentsTest(TestCase):
+    def setUp(self):
+        User.objects.bulk_create(User(username=f'user{i}') for i in range(25))
+        self.users = User.objects.order_by('pk')
+
+    def test_matches_list_rendering(self):
+        expected = ''.join(registry['button'](**user_props(u)).render() for u in list(self.users))
+        self.assertEqual(''.join(render_rows(self.users, 'button', user_props, chunk_size=10)), expected)
+
+    def test_chunks(self):
+        chunks = list(render_rows(self.users, registry['button'], user_props, chunk_size=10))
+        self.assertEqual([chunk.count('<button') for chunk in chunks], [10, 10, 5])
+
+    def test_queryset_is_not_cached(self):
+        list(render_rows(self.users, 'button', user_props))
+        self.assertIsNone(self.users._result_cache)
+
+    def test_response(self):
+        response = stream_components(
+            self.users, 'button', user_props, chunk_size=10,
+            slots=lambda user: {'default': ''}, before='<div>', after='</div>')
+        self.assertTrue(response.streaming)
+        html = b''.join(response.streaming_content).decode()
+        self.assertTrue(html.startswith('<div><button'))
+        self.assertTrue(html.endswith('</button></div>'))
+        self.assertEqual(html.count('<button'), 25)
@@ -0,0 +1,141 @@
+import sys
+import types
+from unittest import mock
+
+from django.test import TestCase
+from djuno import tracing
+from djuno.registry import registry
+
+
+class TracingTest(TestCase):
+    def setUp(self):
+        self.exporter = tracing.InMemoryExporter()
+        tracing.set_exporter(self.exporter)
+        self.addCleanup(tracing.set_exporter, None)
+
+    def test_render_span(self):
+        html = registry['icon'](name='star').render()
+        span = [s for s in self.exporter.spans if s.name == 'djuno.render'][0]
+        self.assertEqual(span.attributes['djuno.component'], 'icon')
+        self.assertEqual(span.attributes['djuno.bytes_out'], len(html))
+        self.assertEqual(span.attributes['djuno.props_count'], len(registry['icon'].props))
+        self.assertGreaterEqual(span.duration_ns, 0)
+
+    def test_lookup_cache_hit(self):
+        registry['icon']
+        self.exporter.clear()
+        registry['icon']
+        self.assertEqual(self.exporter.spans[0].name, 'djuno.lookup')
+        self.assertTrue(self.exporter.spans[0].attributes['djuno.cache_hit'])
+
+    def test_nested_spans_and_errors(self):
+        @tracing.traced('outer')
+        def outer():
+            return inner()
+
+        @tracing.traced('inner')
+        def inner():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            outer()
+        inner_span, outer_span = self.exporter.spans
+        self.assertIs(inner_span.parent, outer_span)
+        self.assertIsInstance(outer_span.error, ValueError)
+
+    def test_disabled(self):
+        tracing.set_exporter(None)
+        registry['icon'](name='star').render()
+        self.assertEqual(self.exporter.spans, [])
+
+
+class StubSpan:
+    def __init__(self, name, context, start_time):
+        self.name = name
+        self.parent = context['span'] if context else None
+        self.start_time = start_time
+        self.attributes = {}
+        self.exceptions = []
+        self.status = None
+        self.end_time = None
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def set_status(self, status):
+        self.status = status
+
+    def end(self, end_time=None):
+        self.end_time = end_time
+
+
+class StubTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, context=None, start_time=None):
+        span = StubSpan(name, context, start_time)
+        self.spans.append(span)
+        return span
+
+
+def stub_opentelemetry(tracer):
+    """``opentelemetry`` and ``opentelemetry.trace`` modules backed by ``tracer``."""
+    trace = types.ModuleType('opentelemetry.trace')
+    trace.get_tracer = lambda name: tracer
+    trace.set_span_in_context = lambda span: {'span': span}
+    trace.StatusCode = types.SimpleNamespace(ERROR='ERROR')
+    trace.Status = lambda code: ('status', code)
+    package = types.ModuleType('opentelemetry')
+    package.trace = trace
+    return {'opentelemetry': package, 'opentelemetry.trace': trace}
+
+
+class OpenTelemetryExporterTest(TestCase):
+    def setUp(self):
+        self.tracer = StubTracer()
+        patcher = mock.patch.dict(sys.modules, stub_opentelemetry(self.tracer))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tracing.set_exporter(tracing.OpenTelemetryExporter())
+        self.addCleanup(tracing.set_exporter, None)
+
+    def test_spans_keep_parents_attributes_and_times(self):
+        @tracing.traced('outer', lambda: {'djuno.component': 'page'})
+        def outer():
+            tracing.set_attribute('djuno.extra', 1)
+            return inner()
+
+        @tracing.traced('inner')
+        def inner():
+            return 'ok'
+
+        outer()
+        outer_span, inner_span = self.tracer.spans
+        self.assertIs(inner_span.parent, outer_span)
+        self.assertIsNone(outer_span.parent)
+        self.assertEqual(outer_span.attributes, {'djuno.component': 'page', 'djuno.extra': 1})
+        for span in (outer_span, inner_span):
+            self.assertIsNotNone(span.end_time)
+            self.assertGreaterEqual(span.end_time, span.start_time)
+            self.assertIsNone(span.status)
+
+    def test_errors_set_the_status(self):
+        @tracing.traced('failing')
+        def failing():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            failing()
+        span, = self.tracer.spans
+        self.assertIsInstance(span.exceptions[0], ValueError)
+        self.assertEqual(span.status, ('status', 'ERROR'))
+        self.assertIsNotNone(span.end_time)
+
+    def test_missing_package(self):
+        with mock.patch.dict(sys.modules, {'opentelemetry': None}):
+            with self.assertRaises(ImportError):
+                tracing.OpenTelemetryExporter()
@@ -0,0 +1,112 @@
+import html
+import json
+import re
+import secrets
+
+from django.test import TestCase, override_settings
+
+
+class RenderComponentViewTest(TestCase):
+    url = '/djuno/components/button/'
+
+    def test_render(self):
+        response = self.client.get(self.url, {'text': 'Save'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_not_modified(self):
+        response = self.client.get(self.url, {'text': 'Save'})
+        response = self.client.get(
+            self.url, {'text': 'Save'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_props(self):
+        first = self.client.get(self.url, {'text': 'Save'})
+        second = self.client.get(self.url, {'text': 'Cancel'})
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+    def test_invalid_props(self):
+        response = self.client.get(self.url, {'text': 'Save', 'js': 'invalid'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {'text': 'Save', 'bogus': '1'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_component(self):
+        response = self.client.get('/djuno/components/missing/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_htmx_button_posts_to_the_component_view(self):
+        from djuno.registry import registry
+
+        button = registry['button'](text='Save', js='htmx').render()
+        url = re.search(r'hx-post="([^"]+)"', button).group(1)
+        values = json.loads(html.unescape(re.search(r'hx-vals="([^"]+)"', button).group(1)))
+        self.assertEqual(url, self.url)
+        response = self.client.post(url, values)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), button)
+
+    def test_post_is_not_cached(self):
+        response = self.client.post(self.url, {'text': 'Save'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-store', response['Cache-Control'])
+
+
+class LazyComponentTest(TestCase):
+    def test_placeholder(self):
+        from djuno.registry import registry
+
+        html = registry['button'](text='Later', lazy='true').render()
+        self.assertIn('hx-trigger="revealed"', html)
+        self.assertIn('/djuno/components/button/?token=', html)
+        self.assertNotIn('Later', html)
+
+    def test_token_renders_component(self):
+        from djuno.registry import registry
+
+        button = registry['button'](text='Later', lazy=True)
+        response = self.client.get(
+            '/djuno/components/button/', {'token': button.get_lazy_token()})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Later', response.content.decode())
+
+    def test_tampered_token(self):
+        from djuno.registry import registry
+
+        token = registry['button'](text='Later', lazy=True).get_lazy_token()
+        response = self.client.get(
+            '/djuno/components/button/', {'token': token[:-1] + 'x'})
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_token_is_bound_to_its_component(self):
+        from djuno.registry import registry
+
+        token = registry['button'](text='Later', lazy=True).get_lazy_token()
+        response = self.client.get('/djuno/components/icon/', {'token': token})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(DJUNO_LAZY_TOKEN_MAX_AGE=-1)
+    def test_expired_token(self):
+        from djuno.registry import registry
+
+        token = registry['button'](text='Later', lazy=True).get_lazy_token()
+        response = self.client.get('/djuno/components/button/', {'token': token})
+        self.assertEqual(response.status_code, 400)
+
+    def test_oversized_slots_are_rejected(self):
+        from djuno.registry import registry
+
+        button = registry['button'](text='Later', lazy=True, slots={'default': secrets.token_hex(4096)})
+        with self.assertRaises(ValueError):
+            button.render()
+
+
+class IndexViewTest(TestCase):
+    def test_component_tags(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<symbol id="star"')
+        self.assertContains(response, 'xlink:href="#star"')
+        self.assertContains(response, '.icon_default_abc123 {')
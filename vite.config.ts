@@ -10,6 +10,7 @@ export default defineConfig({
   },
   build: {
     outDir: 'static/vite',
+    manifest: true,
     rollupOptions: {
       input: 'components/*/*.dj'
     }